@@ -0,0 +1,161 @@
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from pymongo import monitoring
+from metrics import lang_label, route_label
+import logging
+import orjson
+import os
+import queue
+import random
+import sys
+import threading
+import time
+
+# Access log configuration
+ACCESS_LOG_ENABLED = os.environ.get('ACCESS_LOG_ENABLED', 'true').lower() == 'true'
+# Write to a file instead of stdout
+ACCESS_LOG_PATH = os.environ.get('ACCESS_LOG_PATH')
+# Default share of requests logged and per-route overrides, e.g.
+# "/api/health=0.01,/api/metrics=0"; server errors are always logged
+ACCESS_LOG_SAMPLE_RATE = float(os.environ.get('ACCESS_LOG_SAMPLE_RATE', '1'))
+ACCESS_LOG_ROUTE_SAMPLE_RATES = {
+    route.strip(): float(rate)
+    for route, _, rate in (
+        item.partition("=") for item in os.environ.get('ACCESS_LOG_SAMPLE_RATES', '').split(",") if item
+    )
+}
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+access_logger = logging.getLogger("access")
+
+_listeners = []
+
+def configure_logging(level=logging.INFO):
+    """Route application and access logs through queues
+
+    Loggers only enqueue records; the stream and file writes happen on
+    listener threads, so log I/O never blocks the event loop. Access
+    records are JSON lines on their own stream.
+    """
+    if _listeners:
+        return
+
+    application_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    root = logging.getLogger()
+    root.handlers = [QueueHandler(application_queue)]
+    root.setLevel(level)
+    _listeners.append(QueueListener(application_queue, handler))
+
+    access_queue = queue.SimpleQueue()
+    access_handler = logging.FileHandler(ACCESS_LOG_PATH) if ACCESS_LOG_PATH else logging.StreamHandler(sys.stdout)
+    access_handler.setFormatter(logging.Formatter("%(message)s"))
+    access_logger.handlers = [QueueHandler(access_queue)]
+    access_logger.setLevel(logging.INFO)
+    access_logger.propagate = False
+    _listeners.append(QueueListener(access_queue, access_handler))
+
+    for listener in _listeners:
+        listener.start()
+
+def stop_logging():
+    """Flush queued records (called on shutdown)"""
+    while _listeners:
+        _listeners.pop().stop()
+
+class RequestStats:
+    """Per-request figures filled in while the request is handled"""
+
+    __slots__ = ("db_seconds", "cache", "_lock")
+
+    def __init__(self):
+        self.db_seconds = 0.0
+        self.cache = None
+        # MongoDB commands of one request may complete on several executor threads
+        self._lock = threading.Lock()
+
+    def add_db_time(self, seconds):
+        with self._lock:
+            self.db_seconds += seconds
+
+_stats = ContextVar("request_stats", default=None)
+
+# A request reading several entries reports the worst outcome among them
+CACHE_OUTCOMES = ("hit", "miss", "stale")
+
+def record_cache(outcome):
+    """Note a content cache hit, miss or stale read for the current request's access log"""
+    stats = _stats.get()
+    if stats is not None and (
+        stats.cache is None or CACHE_OUTCOMES.index(outcome) > CACHE_OUTCOMES.index(stats.cache)
+    ):
+        stats.cache = outcome
+
+class AccessLogCommandListener(monitoring.CommandListener):
+    """Add MongoDB command time to the request that issued the command"""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        stats = _stats.get()
+        if stats is not None:
+            stats.add_db_time(event.duration_micros / 1e6)
+
+    def failed(self, event):
+        self.succeeded(event)
+
+# Listeners passed to the MongoDB client (see database.py)
+MONGO_LISTENERS = [AccessLogCommandListener()] if ACCESS_LOG_ENABLED else []
+
+class AccessLogMiddleware:
+    """Emit one structured access record per (sampled) request"""
+
+    def __init__(self, app, sample_rate=ACCESS_LOG_SAMPLE_RATE, route_sample_rates=ACCESS_LOG_ROUTE_SAMPLE_RATES):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.route_sample_rates = route_sample_rates
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        status = 500
+        sent = 0
+
+        async def send_with_stats(message):
+            nonlocal status, sent
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                sent += len(message.get("body", b""))
+            await send(message)
+
+        reset = _stats.set(stats)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            elapsed = time.perf_counter() - start
+            _stats.reset(reset)
+            route = route_label(scope)
+            rate = self.route_sample_rates.get(route, self.sample_rate)
+            if status >= 500 or (rate > 0 and (rate >= 1 or random.random() < rate)):
+                access_logger.info(orjson.dumps({
+                    "time": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+                    "method": scope["method"],
+                    "route": route,
+                    "path": scope["path"],
+                    "lang": lang_label(scope) or None,
+                    "status": status,
+                    "latency_ms": round(elapsed * 1000, 3),
+                    "bytes": sent,
+                    "cache": stats.cache,
+                    "db_ms": round(stats.db_seconds * 1000, 3),
+                    "sample_rate": rate,
+                }).decode())
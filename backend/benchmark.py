@@ -0,0 +1,343 @@
+"""Load/benchmark suite for the portfolio API
+
+Seeds a dataset (seed_data.py plus generate_data.py), drives every
+endpoint with an async HTTP client and reports throughput and
+p50/p95/p99 latency per scenario as JSON::
+
+    python benchmark.py --fake --posts 500 --output baseline.json
+    python benchmark.py --fake --posts 500 --baseline baseline.json
+
+By default the app runs in-process (no network); ``--fake`` replaces
+MongoDB with an in-memory mongomock-motor database. Otherwise the server
+at MONGO_URL is used (e.g. a local mongod) with the database named by
+``--db``; seeding replaces its content, so it must not be the app's own
+DB_NAME. ``--url`` benchmarks an already running server instead.
+
+Two load models are supported: closed-loop (``--concurrency`` workers
+issuing requests back to back) and open-loop (``--rps``, requests fired
+on a fixed schedule; latency is measured from the scheduled send time so
+queueing delay is not hidden when the server falls behind).
+"""
+from contextlib import asynccontextmanager
+from datetime import datetime
+from dotenv import dotenv_values
+from pathlib import Path
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+ROOT_DIR = Path(__file__).parent
+
+# Percentiles reported per scenario
+PERCENTILES = (50, 95, 99)
+
+# Relative p95 increase that counts as a regression against a baseline
+REGRESSION_THRESHOLD = 0.2
+
+def install_fake_mongo():
+    """Swap motor's client for mongomock-motor before database.py is imported"""
+    try:
+        import mongomock_motor
+    except ImportError:
+        sys.exit("--fake needs the mongomock-motor package (pip install mongomock-motor)")
+    import motor.motor_asyncio
+
+    class FakeClient(mongomock_motor.AsyncMongoMockClient):
+        # Pool, timeout and listener options do not apply to the fake
+        def __init__(self, url, **options):
+            super().__init__(url)
+
+    motor.motor_asyncio.AsyncIOMotorClient = FakeClient
+    os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+    os.environ.setdefault("DB_NAME", "portfolio_benchmark")
+    # The fake has no change streams
+    os.environ.setdefault("INVALIDATION_MODE", "poll")
+
+def scenarios(context):
+    """(name, method, path factory, body factory) for every endpoint
+
+    Factories take a random.Random so request mixes are reproducible.
+    """
+    counter = itertools.count()
+    langs = ("en", "no")
+    slugs = context["slugs"]
+
+    def get(path):
+        return lambda rng: path.format(lang=rng.choice(langs))
+
+    def unique_email():
+        return f"bench-{context['run_id']}-{next(counter)}@example.com"
+
+    return [
+        ("health", "GET", get("/api/health"), None),
+        ("portfolio", "GET", get("/api/portfolio?lang={lang}"), None),
+        ("timeline", "GET", get("/api/timeline?lang={lang}"), None),
+        ("projects", "GET", get("/api/projects?lang={lang}"), None),
+        ("projects_featured", "GET", get("/api/projects?lang={lang}&featured_only=true"), None),
+        ("blog_list", "GET", get("/api/blog?lang={lang}&limit=20"), None),
+        (
+            "blog_detail", "GET",
+            lambda rng: "/api/blog/{slug}?lang={lang}".format(**rng.choice(slugs)),
+            None
+        ),
+        ("bootstrap", "GET", get("/api/bootstrap?lang={lang}"), None),
+        (
+            "search", "GET",
+            lambda rng: "/api/search?lang={}&q={}".format(*rng.choice(context["queries"])),
+            None
+        ),
+        ("contacts", "GET", get("/api/contacts?limit=100"), None),
+        ("newsletter", "GET", get("/api/newsletter?limit=100"), None),
+        ("contacts_export", "GET", get("/api/contacts/export?format=ndjson"), None),
+        ("newsletter_export", "GET", get("/api/newsletter/export?format=csv"), None),
+        ("metrics", "GET", get("/api/metrics"), None),
+        (
+            "contact_submit", "POST", get("/api/contact"),
+            lambda rng: {
+                "name": "Benchmark",
+                "email": unique_email(),
+                "subject": "Benchmark",
+                "message": "Load test submission " * rng.randint(1, 20),
+            }
+        ),
+        (
+            "newsletter_subscribe", "POST", get("/api/newsletter"),
+            lambda rng: {"email": unique_email()}
+        ),
+    ]
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-pct * len(sorted_values) // 100))
+    return sorted_values[int(rank) - 1]
+
+def summarize(latencies, errors, elapsed):
+    latencies.sort()
+    summary = {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else None,
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else None,
+    }
+    for pct in PERCENTILES:
+        value = percentile(latencies, pct)
+        summary[f"p{pct}_ms"] = round(value * 1000, 3) if value is not None else None
+    return summary
+
+async def run_scenario(client, scenario, requests, concurrency, rps, rng):
+    """Issue ``requests`` requests of one scenario and summarize the latencies"""
+    name, method, path_factory, body_factory = scenario
+    calls = [
+        (path_factory(rng), body_factory(rng) if body_factory else None)
+        for _ in range(requests)
+    ]
+    latencies = []
+    errors = 0
+
+    async def issue(path, body, started):
+        nonlocal errors
+        try:
+            response = await client.request(method, path, json=body)
+            # Read streamed bodies completely, as a browser would
+            await response.aread()
+            if response.status_code >= 400:
+                errors += 1
+        except Exception:
+            errors += 1
+        latencies.append(time.perf_counter() - started)
+
+    begin = time.perf_counter()
+    if rps:
+        # Open loop: send on schedule whether or not earlier requests finished
+        tasks = []
+        for index, (path, body) in enumerate(calls):
+            scheduled = begin + index / rps
+            await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+            tasks.append(asyncio.create_task(issue(path, body, scheduled)))
+        await asyncio.gather(*tasks)
+    else:
+        # Closed loop: each worker sends its next request when the last completes
+        pending = iter(calls)
+
+        async def worker():
+            for path, body in pending:
+                await issue(path, body, time.perf_counter())
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return summarize(latencies, errors, time.perf_counter() - begin)
+
+async def seed(counts, seed_value):
+    """Seed the hand-written dataset plus generated documents (see generate_data.py)"""
+    import generate_data
+    import seed_data
+
+    await seed_data.seed_database()
+    await generate_data.generate(counts, seed_value)
+
+async def discover(client):
+    """Collect slugs and search terms from the API for the request mix"""
+    slugs, queries = [], []
+    for lang in ("en", "no"):
+        response = await client.get(f"/api/blog?lang={lang}&limit=100")
+        for post in response.json():
+            slugs.append({"slug": post["slug"], "lang": lang})
+            word = max(post["title"].split(), key=len)
+            queries.append((lang, word))
+    return slugs, queries or [("en", "data")]
+
+@asynccontextmanager
+async def in_process_client(counts, seed_value):
+    import httpx
+    from search_index import search_index
+    import server
+
+    # Per-request logs (e.g. contact submissions) would dominate the output
+    logging.getLogger().setLevel(logging.WARNING)
+
+    async with server.app.router.lifespan_context(server.app):
+        await seed(counts, seed_value)
+        await search_index.rebuild()
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            yield client
+
+@asynccontextmanager
+async def remote_client(url):
+    import httpx
+
+    async with httpx.AsyncClient(base_url=url, timeout=30) as client:
+        yield client
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """Print p95 changes against a baseline and return the regressed scenarios"""
+    regressions = []
+    for name, summary in results.items():
+        before = baseline.get("results", {}).get(name)
+        if not before or not before.get("p95_ms") or summary["p95_ms"] is None:
+            continue
+        change = summary["p95_ms"] / before["p95_ms"] - 1
+        marker = "REGRESSION" if change > threshold else ""
+        print(f"  {name:22} p95 {before['p95_ms']:9.3f} -> {summary['p95_ms']:9.3f} ms ({change:+.0%}) {marker}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+async def benchmark(args):
+    rng = random.Random(args.seed)
+    client_context = remote_client(args.url) if args.url else in_process_client(dataset(args), args.seed)
+
+    async with client_context as client:
+        slugs, queries = await discover(client)
+        context = {"slugs": slugs, "queries": queries, "run_id": f"{args.seed}-{int(time.time())}"}
+
+        selected = [
+            scenario for scenario in scenarios(context)
+            if not args.only or scenario[0] in args.only
+        ]
+
+        results = {}
+        for scenario in selected:
+            if args.warmup:
+                await run_scenario(client, scenario, args.warmup, args.concurrency, None, rng)
+            summary = await run_scenario(client, scenario, args.requests, args.concurrency, args.rps, rng)
+            results[scenario[0]] = summary
+            print(
+                f"  {scenario[0]:22} {summary['throughput_rps'] or 0:9.1f} req/s  "
+                f"p50 {summary['p50_ms'] or 0:8.3f}  p95 {summary['p95_ms'] or 0:8.3f}  "
+                f"p99 {summary['p99_ms'] or 0:8.3f} ms  errors {summary['errors']}"
+            )
+
+    return {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "target": args.url or ("in-process (fake MongoDB)" if args.fake else "in-process"),
+            "python": platform.python_version(),
+            "seed": args.seed,
+            "dataset": dataset(args),
+            "requests": args.requests,
+            "concurrency": None if args.rps else args.concurrency,
+            "rps": args.rps,
+        },
+        "results": results,
+    }
+
+def dataset(args):
+    return {
+        "blog_posts": args.posts,
+        "projects": args.projects,
+        "contacts": args.contacts,
+        "newsletter": args.subscribers,
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Benchmark a running server instead of the app in-process")
+    parser.add_argument("--fake", action="store_true", help="Use an in-memory MongoDB fake")
+    parser.add_argument("--db", help="Database to seed and benchmark (required without --fake or --url)")
+    parser.add_argument("--posts", type=int, default=0, help="Generated blog posts to seed")
+    parser.add_argument("--projects", type=int, default=0, help="Generated projects to seed")
+    parser.add_argument("--contacts", type=int, default=0, help="Generated contact submissions to seed")
+    parser.add_argument("--subscribers", type=int, default=0, help="Generated subscribers to seed")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="Closed-loop workers")
+    parser.add_argument("--rps", type=float, help="Open-loop request rate (overrides --concurrency)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the dataset and the request mix")
+    parser.add_argument("--only", nargs="+", help="Run only these scenarios")
+    parser.add_argument("--output", type=Path, help="Write the results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="Compare p95 latency against this JSON file")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="Relative p95 increase reported as a regression")
+    return parser.parse_args(argv)
+
+def use_benchmark_database(name):
+    """Point database.py at ``name``, refusing the app's own database"""
+    if not name:
+        sys.exit("Seeding replaces all content; pass --db with a database reserved for benchmarks")
+    app_database = os.environ.get("DB_NAME") or dotenv_values(ROOT_DIR / ".env").get("DB_NAME")
+    if name == app_database:
+        sys.exit(f"--db {name} is the app's DB_NAME; use a database reserved for benchmarks")
+    os.environ["DB_NAME"] = name
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.fake and not args.url:
+        use_benchmark_database(args.db)
+    if args.fake and not args.url:
+        install_fake_mongo()
+    if not args.url:
+        scratch = Path(tempfile.mkdtemp())
+        # Keep access logging (and its cost) but out of the report
+        os.environ.setdefault("ACCESS_LOG_PATH", str(scratch / "access.log"))
+        # Benchmark submissions must not be replayed into the app's database
+        # by the next server start, nor mixed into its dead letters
+        os.environ.setdefault("CONTACT_SPOOL_DIR", str(scratch / "contact_spool"))
+        os.environ.setdefault("CONTACT_DEAD_LETTER_PATH", str(scratch / "contact_dead_letter.ndjson"))
+    sys.path.insert(0, str(ROOT_DIR))
+
+    report = asyncio.run(benchmark(args))
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        print(f"Compared with {args.baseline}:")
+        regressions = compare(report["results"], json.loads(args.baseline.read_text()), args.threshold)
+        if regressions:
+            sys.exit(f"p95 regressed by more than {args.threshold:.0%} in: {', '.join(regressions)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+from collections import Counter
+from fastapi import HTTPException
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from database import db
+from materializer import materialize_many, render_error
+import revisions
+
+# Per-item outcomes of a bulk upsert
+BULK_STATUSES = ("created", "updated", "failed", "skipped")
+
+def upsert_key(document, key):
+    """Value of the upsert key, e.g. ``id`` or the English ``slug.en``"""
+    value = document
+    for part in key.split("."):
+        value = value[part]
+    return value
+
+def _operation(document, key, insert_only, preserve):
+    """Upsert that updates content fields and fills creation fields on insert
+
+    ``preserve`` fields are only written when they have a value, so an
+    update without them keeps what is stored (e.g. a post's publish date).
+    """
+    on_insert = {field: document[field] for field in insert_only}
+    update = {}
+    for field, value in document.items():
+        if field in insert_only:
+            continue
+        if field in preserve and value is None:
+            on_insert[field] = value
+            continue
+        update[field] = value
+    return UpdateOne(
+        {key: upsert_key(document, key)},
+        {"$set": update, "$setOnInsert": on_insert},
+        upsert=True
+    )
+
+async def bulk_upsert(
+    collection,
+    namespace,
+    documents,
+    key,
+    ordered=False,
+    insert_only=("id", "created_at"),
+    preserve=()
+):
+    """Upsert validated documents with one bulk_write and re-render their views
+
+    Returns ``(results, counts)``: one ``{"index", "key", "status"}`` entry
+    per document (plus ``"error"`` for failures) and a count per status.
+    Documents whose views cannot be rendered fail without being written.
+    With ``ordered`` the write stops at the first failure and the
+    remaining documents are reported as skipped.
+    """
+    keys = [upsert_key(document, key) for document in documents]
+    duplicates = sorted(str(value) for value, seen in Counter(keys).items() if seen > 1)
+    if duplicates:
+        raise HTTPException(status_code=400, detail=f"Duplicate {key} values: {', '.join(duplicates)}")
+
+    statuses = ["updated"] * len(documents)
+    errors = {}
+    for index, document in enumerate(documents):
+        error = render_error(collection, document)
+        if error:
+            errors[index] = error
+    # Positions in ``documents`` of the operations sent to MongoDB
+    writable = [index for index in range(len(documents)) if index not in errors]
+    if ordered and errors:
+        writable = [index for index in writable if index < min(errors)]
+
+    upserted = {}
+    if writable:
+        operations = [_operation(documents[index], key, insert_only, preserve) for index in writable]
+        try:
+            result = await db[collection].bulk_write(operations, ordered=ordered)
+            upserted = result.upserted_ids
+        except BulkWriteError as e:
+            upserted = {item["index"]: item["_id"] for item in e.details.get("upserted", [])}
+            for error in e.details["writeErrors"]:
+                errors[writable[error["index"]]] = error["errmsg"]
+
+    if ordered and errors:
+        for index in range(min(errors) + 1, len(documents)):
+            statuses[index] = "skipped"
+    for position in upserted:
+        statuses[writable[position]] = "created"
+    for index in errors:
+        statuses[index] = "failed"
+
+    written = [keys[index] for index, status in enumerate(statuses) if status in ("created", "updated")]
+    if written:
+        stored = await db[collection].find({key: {"$in": written}}).to_list(None)
+        await materialize_many(collection, stored)
+        await revisions.bump(namespace)
+
+    results = []
+    for index, status in enumerate(statuses):
+        item = {"index": index, "key": keys[index], "status": status}
+        if index in errors:
+            item["error"] = errors[index]
+        results.append(item)
+    counts = {status: statuses.count(status) for status in BULK_STATUSES}
+    return results, counts
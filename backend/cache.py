@@ -0,0 +1,233 @@
+from collections import OrderedDict
+from starlette.exceptions import HTTPException
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+import asyncio
+import contextvars
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+# Cache configuration
+CACHE_TTL_SECONDS = float(os.environ.get('CACHE_TTL_SECONDS', '300'))
+CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', '512'))
+# Hits this close to expiry are served and refreshed in the background (0 disables)
+CACHE_REFRESH_AHEAD_SECONDS = float(os.environ.get('CACHE_REFRESH_AHEAD_SECONDS', '30'))
+# How long past expiry or invalidation a value may stand in for a failed load (0 disables)
+CACHE_STALE_IF_ERROR_SECONDS = float(os.environ.get('CACHE_STALE_IF_ERROR_SECONDS', '86400'))
+
+# Lookup outcomes, as reported to the access log
+HIT = "hit"
+MISS = "miss"
+STALE = "stale"
+
+
+class ContentCache:
+    """In-process read-through cache with TTL expiry and LRU eviction.
+
+    Entries are grouped by namespace (one per content collection). Writes
+    invalidate a namespace by bumping its generation, so entries loaded
+    before the write are never served afterwards as fresh, even if the
+    load was still in flight when the write happened.
+
+    Concurrent misses for the same key share a single load (single-flight):
+    the first caller starts it and later callers await the same result, so
+    a burst after a deploy or an invalidation costs one database query.
+
+    Hits within ``refresh_ahead`` seconds of expiry are answered from the
+    cache while a background load replaces the entry, so popular keys
+    never make a request wait for the database. Expired and invalidated
+    values are kept for ``stale_if_error`` seconds past their expiry and
+    served when a load fails (e.g. MongoDB is unreachable). HTTP errors
+    raised by a loader, such as a 404 for a deleted post, are answers
+    rather than failures and are never papered over.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        ttl: float = CACHE_TTL_SECONDS,
+        refresh_ahead: float = CACHE_REFRESH_AHEAD_SECONDS,
+        stale_if_error: float = CACHE_STALE_IF_ERROR_SECONDS
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.stale_if_error = stale_if_error
+        self._entries: "OrderedDict[Tuple, Tuple[float, int, Any]]" = OrderedDict()
+        self._generations = {}
+        # (full key, generation) -> in-flight load shared by concurrent misses
+        self._inflight: "Dict[Tuple, asyncio.Task]" = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.stale_served = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    def _fresh(self, namespace, full_key):
+        """Return ``(value, expires_at)`` of a servable entry, or None
+
+        Expired and invalidated entries are kept as stale fallbacks until
+        the stale-if-error window has passed as well.
+        """
+        entry = self._entries.get(full_key)
+        if entry is None:
+            return None
+
+        expires_at, generation, value = entry
+        now = time.monotonic()
+        if expires_at + self.stale_if_error < now:
+            del self._entries[full_key]
+            return None
+        if expires_at < now or generation != self._generation(namespace):
+            return None
+
+        self._entries.move_to_end(full_key)
+        return value, expires_at
+
+    def get(self, namespace: str, key: Tuple[Hashable, ...]) -> Any:
+        """Return the cached value or None if missing, expired or invalidated"""
+        fresh = self._fresh(namespace, (namespace,) + key)
+        return fresh[0] if fresh is not None else None
+
+    def get_stale(self, namespace: str, key: Tuple[Hashable, ...]) -> Any:
+        """Return the last stored value, even if expired or invalidated, or None"""
+        entry = self._entries.get((namespace,) + key)
+        if entry is None or entry[0] + self.stale_if_error < time.monotonic():
+            return None
+        return entry[2]
+
+    def set(self, namespace: str, key: Tuple[Hashable, ...], value: Any, generation: int = None) -> Any:
+        """Store a value, evicting the least recently used entries when full
+
+        A reloaded value equal to the stored one keeps the stored object,
+        along with anything memoized on it (e.g. compressed variants). The
+        value now cached is returned.
+        """
+        if generation is None:
+            generation = self._generation(namespace)
+        if generation != self._generation(namespace):
+            # Namespace was invalidated while the value was being loaded
+            return value
+
+        full_key = (namespace,) + key
+        entry = self._entries.get(full_key)
+        if entry is not None and entry[2] == value:
+            value = entry[2]
+        self._entries[full_key] = (time.monotonic() + self.ttl, generation, value)
+        self._entries.move_to_end(full_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    async def lookup(
+        self,
+        namespace: str,
+        key: Tuple[Hashable, ...],
+        loader: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, str]:
+        """Return ``(value, outcome)``, loading and storing the value on a miss
+
+        ``outcome`` is ``HIT``, ``MISS``, or ``STALE`` when the load failed
+        and an old value was served in its place.
+        """
+        full_key = (namespace,) + key
+        fresh = self._fresh(namespace, full_key)
+        if fresh is not None:
+            self.hits += 1
+            value, expires_at = fresh
+            if expires_at - time.monotonic() < self.refresh_ahead:
+                self._refresh(namespace, key, loader)
+            return value, HIT
+
+        self.misses += 1
+        task = self._flight(namespace, key, loader)
+        try:
+            # Shielded: a caller that goes away must not cancel the shared load
+            value = await asyncio.shield(task)
+        except HTTPException:
+            raise
+        except Exception as e:
+            value = self.get_stale(namespace, key)
+            if value is None:
+                raise
+            self.stale_served += 1
+            logger.warning(f"Serving stale {namespace} content for {key}: {str(e)}")
+            return value, STALE
+        return value, MISS
+
+    def _flight(self, namespace, key, loader, background=False):
+        """Return the in-flight load of a key, starting it if there is none"""
+        generation = self._generation(namespace)
+        # Keyed on the generation so reads after an invalidation never join
+        # a load that started before it
+        flight_key = ((namespace,) + key, generation)
+        task = self._inflight.get(flight_key)
+        if task is not None:
+            if not background:
+                self.coalesced += 1
+            return task
+
+        load = self._load(namespace, key, loader, generation)
+        if background:
+            # Run outside the triggering request's context, so its access
+            # log and profile are not charged for the refresh
+            task = contextvars.Context().run(asyncio.ensure_future, load)
+        else:
+            task = asyncio.ensure_future(load)
+        self._inflight[flight_key] = task
+        task.add_done_callback(lambda done: self._land(flight_key, done))
+        return task
+
+    def _refresh(self, namespace, key, loader):
+        """Reload a nearly expired entry without waiting for the result"""
+        if ((namespace,) + key, self._generation(namespace)) in self._inflight:
+            return
+        self.refreshes += 1
+        task = self._flight(namespace, key, loader, background=True)
+        task.add_done_callback(lambda done: self._refreshed(namespace, key, done))
+
+    def _refreshed(self, namespace, key, task):
+        if task.cancelled() or task.exception() is None:
+            return
+        # The current value stays until it expires, then serves as stale
+        self.refresh_failures += 1
+        logger.warning(f"Error refreshing {namespace} content for {key}: {str(task.exception())}")
+
+    async def _load(self, namespace, key, loader, generation):
+        return self.set(namespace, key, await loader(), generation)
+
+    def _land(self, flight_key, task):
+        self._inflight.pop(flight_key, None)
+        # Mark a failure as retrieved even if every caller has gone away
+        if not task.cancelled():
+            task.exception()
+
+    async def get_or_load(
+        self,
+        namespace: str,
+        key: Tuple[Hashable, ...],
+        loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return the cached value, loading and storing it on a miss"""
+        value, _ = await self.lookup(namespace, key, loader)
+        return value
+
+    def invalidate(self, namespace: str) -> None:
+        """Stop serving every entry in a namespace, keeping them as stale fallbacks"""
+        self._generations[namespace] = self._generation(namespace) + 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Shared cache for localized content endpoints
+content_cache = ContentCache()
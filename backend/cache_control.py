@@ -0,0 +1,63 @@
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+class CachePolicy:
+    """Cache-Control policy for the responses of one router
+
+    ``no_store`` policies apply to every response a handler returns; the
+    others only to successful GET/HEAD responses (including 304s), so
+    errors and writes are never cached by browsers or CDNs.
+    """
+
+    def __init__(
+        self,
+        max_age=0,
+        s_maxage=None,
+        stale_while_revalidate=None,
+        stale_if_error=None,
+        private=False,
+        no_store=False
+    ):
+        self.no_store = no_store
+        if no_store:
+            directives = ["private", "no-store"] if private else ["no-store"]
+        else:
+            directives = ["private" if private else "public", f"max-age={max_age}"]
+            if s_maxage is not None and not private:
+                directives.append(f"s-maxage={s_maxage}")
+            if stale_while_revalidate is not None:
+                directives.append(f"stale-while-revalidate={stale_while_revalidate}")
+            if stale_if_error is not None:
+                directives.append(f"stale-if-error={stale_if_error}")
+        self.header = ", ".join(directives)
+
+    def apply(self, request: Request, response: Response):
+        if "cache-control" in response.headers:
+            return
+        if self.no_store:
+            response.headers["Cache-Control"] = self.header
+        elif request.method in ("GET", "HEAD") and (response.status_code < 300 or response.status_code == 304):
+            response.headers["Cache-Control"] = self.header
+            # Compressed and uncompressed bodies must be cached separately
+            vary = response.headers.get("vary", "")
+            if "accept-encoding" not in vary.lower():
+                response.headers["Vary"] = f"{vary}, Accept-Encoding" if vary else "Accept-Encoding"
+
+def cached_route(policy: CachePolicy):
+    """APIRoute class applying ``policy``; pass as a router's ``route_class``"""
+
+    class CachedRoute(APIRoute):
+        def get_route_handler(self):
+            handler = super().get_route_handler()
+
+            async def handler_with_policy(request: Request) -> Response:
+                response = await handler(request)
+                policy.apply(request, response)
+                return response
+
+            return handler_with_policy
+
+    return CachedRoute
+
+# Admin and operational endpoints: never stored anywhere
+NO_STORE = CachePolicy(private=True, no_store=True)
@@ -0,0 +1,173 @@
+from concurrent.futures import ThreadPoolExecutor
+from starlette.datastructures import Headers, MutableHeaders
+import brotli
+import gzip
+import os
+import threading
+import zlib
+
+# Responses smaller than this are sent uncompressed
+MINIMUM_SIZE = int(os.environ.get('COMPRESSION_MINIMUM_SIZE', '1024'))
+
+# Levels for per-request compression; cached payloads are recompressed
+# once per content version at the maximum level, off the event loop
+GZIP_LEVEL = int(os.environ.get('GZIP_LEVEL', '6'))
+BROTLI_QUALITY = int(os.environ.get('BROTLI_QUALITY', '5'))
+STATIC_GZIP_LEVEL = 9
+STATIC_BROTLI_QUALITY = 11
+# Threads building maximum-level variants; brotli and zlib release the GIL
+STATIC_COMPRESSION_WORKERS = int(os.environ.get('STATIC_COMPRESSION_WORKERS', '2'))
+
+def _lower_priority():
+    # Linux nice values are per thread: request handling comes first
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+    except (AttributeError, OSError):
+        pass
+
+static_executor = ThreadPoolExecutor(
+    max_workers=STATIC_COMPRESSION_WORKERS,
+    thread_name_prefix="static-compression",
+    initializer=_lower_priority
+)
+
+# Supported encodings in order of preference
+ENCODINGS = ("br", "gzip")
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+def choose_encoding(accept_encoding):
+    """Pick the preferred supported encoding from an Accept-Encoding header"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    for encoding in ENCODINGS:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+def compress(body, encoding, static=False):
+    """Compress a complete body with the given encoding"""
+    if encoding == "br":
+        return brotli.compress(body, quality=STATIC_BROTLI_QUALITY if static else BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=STATIC_GZIP_LEVEL if static else GZIP_LEVEL)
+
+class StreamCompressor:
+    """Incremental compressor that flushes after every chunk"""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data, final=False):
+        if self.encoding == "br":
+            chunk = self._compressor.process(data)
+            return chunk + (self._compressor.finish() if final else self._compressor.flush())
+        chunk = self._compressor.compress(data)
+        return chunk + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+class CompressionMiddleware:
+    """Negotiate gzip/brotli for responses that are not already encoded
+
+    Content routes send precompressed payloads themselves (see
+    responses.json_response); this covers everything else, including
+    streamed responses.
+    """
+
+    def __init__(self, app, minimum_size=MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self.app, encoding, self.minimum_size)
+        await responder(scope, receive, send)
+
+class _CompressionResponder:
+    def __init__(self, app, encoding, minimum_size):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send = None
+        self.start_message = None
+        self.passthrough = False
+        self.compressor = None
+
+    async def __call__(self, scope, receive, send):
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message):
+        if message["type"] == "http.response.start":
+            # Hold the headers until the first body chunk shows the size
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            )
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start_message, self.start_message = self.start_message, None
+            headers = MutableHeaders(raw=start_message["headers"])
+
+            if self.passthrough or (not more_body and len(body) < self.minimum_size):
+                self.passthrough = True
+                await self.send(start_message)
+                await self.send(message)
+                return
+
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+
+            if not more_body:
+                compressed = compress(body, self.encoding)
+                headers["Content-Length"] = str(len(compressed))
+                await self.send(start_message)
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+
+            # Streaming response: length is unknown, compress chunk by chunk
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            self.compressor = StreamCompressor(self.encoding)
+            await self.send(start_message)
+
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        await self.send({
+            "type": "http.response.body",
+            "body": self.compressor.compress(body, final=not more_body),
+            "more_body": more_body
+        })
@@ -0,0 +1,312 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from pymongo.errors import BulkWriteError, ConnectionFailure, ExecutionTimeout, WriteConcernError
+from database import db
+import asyncio
+import fcntl
+import itertools
+import logging
+import orjson
+import os
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).parent
+
+# Queue configuration
+CONTACT_QUEUE_SIZE = int(os.environ.get('CONTACT_QUEUE_SIZE', '1000'))
+CONTACT_BATCH_SIZE = int(os.environ.get('CONTACT_BATCH_SIZE', '100'))
+CONTACT_BATCH_WAIT = float(os.environ.get('CONTACT_BATCH_WAIT_SECONDS', '0.5'))
+CONTACT_DRAIN_TIMEOUT = float(os.environ.get('CONTACT_DRAIN_TIMEOUT_SECONDS', '10'))
+# Each process claims its own spool file in this directory
+CONTACT_SPOOL_DIR = Path(os.environ.get('CONTACT_SPOOL_DIR', ROOT_DIR / 'contact_spool'))
+CONTACT_SPOOL_FSYNC = os.environ.get('CONTACT_SPOOL_FSYNC', 'false').lower() == 'true'
+# The spool is rewritten with only the pending submissions once it grows past this
+CONTACT_SPOOL_COMPACT_BYTES = int(os.environ.get('CONTACT_SPOOL_COMPACT_BYTES', str(1024 * 1024)))
+CONTACT_DEAD_LETTER_PATH = Path(
+    os.environ.get('CONTACT_DEAD_LETTER_PATH', ROOT_DIR / 'contact_dead_letter.ndjson')
+)
+
+DUPLICATE_KEY = 11000
+
+# Failures worth retrying; anything else (e.g. DocumentTooLarge or a
+# validation error) fails the same way every time
+RETRYABLE_ERRORS = (ConnectionFailure, ExecutionTimeout, WriteConcernError)
+
+class ContactQueue:
+    """Bounded write-behind queue for contact form submissions
+
+    Submissions are appended to a local spool file and acknowledged
+    immediately; a background worker batches them into ``insert_many``.
+    Flushed ids are recorded in the spool, so anything not yet written
+    when the process stops is replayed on the next start. Replays are
+    idempotent thanks to the unique index on ``contacts.id``.
+
+    Every process (e.g. each ``uvicorn --workers`` worker) owns one spool
+    slot in ``spool_dir``, held with an exclusive ``flock`` on the slot's
+    lock file for as long as it runs. On start, spools of slots nobody
+    holds (left by processes that exited) are adopted and replayed.
+
+    Transient MongoDB failures are retried until they clear. Submissions
+    that can never be stored are moved to a dead-letter file instead, so
+    one bad document cannot stall the worker. Spool I/O runs on a single
+    writer thread, which keeps the records in order and off the event
+    loop, and compacts the spool as it grows.
+    """
+
+    def __init__(
+        self,
+        spool_dir=CONTACT_SPOOL_DIR,
+        maxsize=CONTACT_QUEUE_SIZE,
+        dead_letter_path=CONTACT_DEAD_LETTER_PATH
+    ):
+        self.spool_dir = Path(spool_dir)
+        self.spool_path = None
+        self.dead_letter_path = Path(dead_letter_path)
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self._spool = None
+        self._lock = None
+        self._worker = None
+        self._replay = []
+        # Only touched from the writer thread: id -> encoded "add" record
+        self._pending = {}
+        self._compacted_bytes = 0
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="contact-spool")
+
+    @staticmethod
+    def _read_spool(path):
+        """Return submissions in a spool file that were never flushed"""
+        pending = {}
+        if not path.exists():
+            return []
+
+        with open(path, "rb") as spool:
+            for line in spool:
+                try:
+                    record = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    # Torn write from a crash; nothing after it is trustworthy
+                    break
+                if record["op"] == "add":
+                    document = record["doc"]
+                    document["submitted_at"] = datetime.fromisoformat(document["submitted_at"])
+                    pending[document["id"]] = document
+                else:
+                    for contact_id in record["ids"]:
+                        pending.pop(contact_id, None)
+        return list(pending.values())
+
+    def _sync(self):
+        self._spool.flush()
+        if CONTACT_SPOOL_FSYNC:
+            os.fsync(self._spool.fileno())
+
+    def _compact(self):
+        """Rewrite the spool with only the pending submissions"""
+        temporary = self.spool_path.with_name(self.spool_path.name + ".tmp")
+        with open(temporary, "wb") as spool:
+            for line in self._pending.values():
+                spool.write(line)
+            spool.flush()
+            if CONTACT_SPOOL_FSYNC:
+                os.fsync(spool.fileno())
+        if self._spool is not None:
+            self._spool.close()
+        os.replace(temporary, self.spool_path)
+        self._spool = open(self.spool_path, "ab")
+        self._compacted_bytes = self._spool.tell()
+
+    def _write(self, record, line):
+        """Append one encoded record to the spool (writer thread only)"""
+        self._spool.write(line)
+        if record["op"] == "add":
+            self._pending[record["doc"]["id"]] = line
+        else:
+            for contact_id in record["ids"]:
+                self._pending.pop(contact_id, None)
+            # Leave room to grow when many submissions are pending
+            if self._spool.tell() > max(CONTACT_SPOOL_COMPACT_BYTES, 2 * self._compacted_bytes):
+                self._compact()
+                return
+        self._sync()
+
+    def _append(self, record):
+        """Queue a spool write on the writer thread, in submission order"""
+        # Encoded here: the worker adds ``_id`` to documents once inserted
+        line = orjson.dumps(record) + b"\n"
+        return asyncio.get_running_loop().run_in_executor(self._writer, self._write, record, line)
+
+    def _try_lock(self, slot):
+        """Return the locked lock file of a spool slot, or None if another process holds it"""
+        lock = open(self.spool_dir / f"spool-{slot}.lock", "ab")
+        try:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock.close()
+            return None
+        return lock
+
+    def _open(self):
+        """Claim a spool slot and adopt the spools of unclaimed ones (writer thread only)"""
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        for slot in itertools.count():
+            self._lock = self._try_lock(slot)
+            if self._lock is not None:
+                break
+        self.spool_path = self.spool_dir / f"spool-{slot}.ndjson"
+
+        replay = {document["id"]: document for document in self._read_spool(self.spool_path)}
+        adopted = []
+        for path in sorted(self.spool_dir.glob("spool-*.ndjson")):
+            other = path.name[len("spool-"):-len(".ndjson")]
+            if path == self.spool_path or not other.isdigit():
+                continue
+            lock = self._try_lock(int(other))
+            if lock is None:
+                continue
+            for document in self._read_spool(path):
+                replay.setdefault(document["id"], document)
+            adopted.append((path, lock))
+
+        self._replay = list(replay.values())
+        self._pending = {
+            document["id"]: orjson.dumps({"op": "add", "doc": document}) + b"\n"
+            for document in self._replay
+        }
+        self._compact()
+        # Only once their submissions are safely in this process's spool
+        for path, lock in adopted:
+            path.unlink()
+            lock.close()
+        if adopted:
+            logger.info(f"Adopted {len(adopted)} contact spool(s) left by stopped processes")
+
+    def _close(self):
+        self._spool.close()
+        # Releases the slot for the next process
+        self._lock.close()
+
+    async def start(self):
+        """Open the spool, schedule replay of unflushed submissions and start the worker"""
+        await asyncio.get_running_loop().run_in_executor(self._writer, self._open)
+
+        if self._replay:
+            logger.info(f"Replaying {len(self._replay)} spooled contact submission(s)")
+        self._worker = asyncio.create_task(self._run())
+
+    async def submit(self, document):
+        """Spool and enqueue a submission, raising asyncio.QueueFull when saturated"""
+        if self.queue.full():
+            raise asyncio.QueueFull()
+        # Scheduled before the worker can see the submission, so its "add"
+        # record always precedes the "done" record
+        spooled = self._append({"op": "add", "doc": document})
+        self.queue.put_nowait(document)
+        await spooled
+
+    async def _next_batch(self):
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        deadline = loop.time() + CONTACT_BATCH_WAIT
+        while len(batch) < CONTACT_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _insert(self, batch):
+        """Insert a batch, retrying transient failures
+
+        Returns ``(document, error)`` pairs for the submissions that can
+        never be stored.
+        """
+        delay = 1
+        while True:
+            try:
+                await db.contacts.insert_many(batch, ordered=False)
+                return []
+            except BulkWriteError as e:
+                # Duplicates were stored by an earlier, unacknowledged flush
+                rejected = [
+                    (batch[error["index"]], error["errmsg"])
+                    for error in e.details["writeErrors"] if error["code"] != DUPLICATE_KEY
+                ]
+                if not e.details.get("writeConcernErrors"):
+                    return rejected
+                logger.error(f"Error storing contact submissions: {str(e)}")
+            except RETRYABLE_ERRORS as e:
+                logger.error(f"Error storing contact submissions: {str(e)}")
+            except Exception as e:
+                if len(batch) == 1:
+                    return [(batch[0], str(e))]
+                # Raised for the whole batch (e.g. DocumentTooLarge); insert
+                # one by one to find the submissions at fault
+                rejected = []
+                for document in batch:
+                    rejected += await self._insert([document])
+                return rejected
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30)
+
+    def _dead_letter(self, rejected):
+        """Record submissions that can never be stored (writer thread only)"""
+        failed_at = datetime.utcnow().isoformat()
+        with open(self.dead_letter_path, "ab") as dead_letter:
+            for document, error in rejected:
+                document.pop("_id", None)
+                dead_letter.write(orjson.dumps({"doc": document, "error": error, "failed_at": failed_at}) + b"\n")
+
+    async def _flush(self, batch):
+        """Store a batch, dead-lettering the submissions that cannot be stored"""
+        rejected = await self._insert(batch)
+        if rejected:
+            for document, error in rejected:
+                logger.error(f"Contact submission {document['id']} cannot be stored, dead-lettered: {error}")
+            await asyncio.get_running_loop().run_in_executor(self._writer, self._dead_letter, rejected)
+
+        await self._append({"op": "done", "ids": [document["id"] for document in batch]})
+        failed = {document["id"] for document, _ in rejected}
+        for document in batch:
+            if document["id"] not in failed:
+                # Here you could add email notification logic
+                logger.info(f"New contact form submission from {document['email']}")
+
+    async def _run(self):
+        while self._replay:
+            batch, self._replay = self._replay[:CONTACT_BATCH_SIZE], self._replay[CONTACT_BATCH_SIZE:]
+            await self._flush([dict(document) for document in batch])
+
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    async def stop(self):
+        """Drain queued submissions (bounded by a timeout) and stop the worker"""
+        if self._worker is None:
+            return
+
+        try:
+            await asyncio.wait_for(self.queue.join(), CONTACT_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"{self.queue.qsize()} contact submission(s) left in the spool for the next start"
+            )
+
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        await asyncio.get_running_loop().run_in_executor(self._writer, self._close)
+
+contact_queue = ContactQueue()
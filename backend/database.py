@@ -1,15 +1,77 @@
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
+import logging
 from dotenv import load_dotenv
 from pathlib import Path
+import access_log
+import metrics
+import profiling
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+logger = logging.getLogger(__name__)
+
+def _int_env(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+class MongoConnection:
+    """Single, tuned MongoDB connection pool shared by the whole process
+
+    The client is created lazily (motor does not open sockets until the
+    first operation), verified on startup with ``open()`` and closed with
+    ``close()`` from the application lifespan.
+    """
+
+    def __init__(self, url, db_name):
+        self.url = url
+        self.db_name = db_name
+        self.options = {
+            "maxPoolSize": _int_env("MONGO_MAX_POOL_SIZE", 100),
+            "minPoolSize": _int_env("MONGO_MIN_POOL_SIZE", 0),
+            "maxIdleTimeMS": _int_env("MONGO_MAX_IDLE_TIME_MS", None),
+            "waitQueueTimeoutMS": _int_env("MONGO_WAIT_QUEUE_TIMEOUT_MS", None),
+            "serverSelectionTimeoutMS": _int_env("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000),
+            "connectTimeoutMS": _int_env("MONGO_CONNECT_TIMEOUT_MS", 10000),
+            "socketTimeoutMS": _int_env("MONGO_SOCKET_TIMEOUT_MS", 20000),
+            "appname": os.environ.get("MONGO_APP_NAME", "portfolio-api"),
+            # Command timing for metrics.py, profiling.py and access_log.py
+            "event_listeners": (
+                metrics.MONGO_LISTENERS + profiling.MONGO_LISTENERS + access_log.MONGO_LISTENERS
+            ),
+        }
+
+        # e.g. "zstd,snappy,zlib"; zstd and snappy need the zstandard and
+        # python-snappy packages, unavailable ones are skipped by pymongo
+        compressors = os.environ.get("MONGO_COMPRESSORS")
+        if compressors:
+            self.options["compressors"] = compressors
+
+        # e.g. "secondaryPreferred" to spread content reads over a replica set
+        read_preference = os.environ.get("MONGO_READ_PREFERENCE")
+        if read_preference:
+            self.options["readPreference"] = read_preference
+
+        self.options = {key: value for key, value in self.options.items() if value is not None}
+        self.client = AsyncIOMotorClient(self.url, **self.options)
+        self.db = self.client[self.db_name]
+
+    async def open(self):
+        """Verify the server is reachable and warm up the pool"""
+        await self.client.admin.command("ping")
+        logger.info(
+            f"Connected to MongoDB database {self.db_name} "
+            f"(maxPoolSize={self.options['maxPoolSize']}, minPoolSize={self.options['minPoolSize']})"
+        )
+
+    def close(self):
+        self.client.close()
+
 # MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+connection = MongoConnection(os.environ['MONGO_URL'], os.environ['DB_NAME'])
+client = connection.client
+db = connection.db
 
 # Collections
 portfolio_collection = db.portfolio
@@ -17,4 +79,10 @@ timeline_collection = db.timeline
 projects_collection = db.projects
 blog_posts_collection = db.blog_posts
 contacts_collection = db.contacts
-newsletter_collection = db.newsletter
\ No newline at end of file
+newsletter_collection = db.newsletter
+
+# Materialized per-language views (see materializer.py)
+portfolio_views_collection = db.portfolio_views
+timeline_views_collection = db.timeline_views
+project_views_collection = db.project_views
+blog_post_views_collection = db.blog_post_views
@@ -0,0 +1,54 @@
+from datetime import datetime
+from fastapi.responses import StreamingResponse
+import csv
+import io
+import orjson
+import os
+
+# Documents fetched per cursor batch (and emitted per chunk) when exporting
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', '500'))
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+def _ndjson_row(document):
+    return orjson.dumps(document, default=str, option=orjson.OPT_APPEND_NEWLINE)
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def _csv_row(document, fields):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(_csv_value(document.get(field)) for field in fields)
+    return buffer.getvalue().encode()
+
+async def _stream_rows(cursor, export_format, fields, batch_size):
+    if export_format == "csv":
+        yield _csv_row(dict(zip(fields, fields)), fields)
+
+    chunk = []
+    async for document in cursor:
+        chunk.append(
+            _csv_row(document, fields) if export_format == "csv" else _ndjson_row(document)
+        )
+        if len(chunk) >= batch_size:
+            yield b"".join(chunk)
+            chunk = []
+
+    if chunk:
+        yield b"".join(chunk)
+
+def export_response(cursor, export_format, fields, filename, batch_size=EXPORT_BATCH_SIZE):
+    """Stream a motor cursor as NDJSON or CSV, holding at most one batch in memory"""
+    cursor.batch_size(batch_size)
+    return StreamingResponse(
+        _stream_rows(cursor, export_format, fields, batch_size),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'}
+    )
@@ -0,0 +1,305 @@
+"""Deterministic synthetic dataset for scale testing
+
+Generates blog posts, projects, timeline entries, contact submissions
+and newsletter subscribers with bilingual text of realistic length and
+inserts them in parallel batches::
+
+    python generate_data.py --posts 5000 --contacts 100000 --subscribers 50000 --seed 7
+
+The same seed and counts always produce the same documents; each
+collection draws from its own random stream, so changing one count does
+not change the documents generated for the others.
+"""
+from datetime import datetime, timedelta
+import argparse
+import asyncio
+import random
+import re
+import time
+import unicodedata
+import uuid
+from database import db
+import materializer
+import revisions
+
+# Documents per insert_many call and insert_many calls in flight
+GENERATE_BATCH_SIZE = 1000
+GENERATE_CONCURRENCY = 4
+
+# Published posts share a publication date now and then, exercising the
+# _id tie-breaker of the keyset pagination
+PUBLISHED_SHARE = 0.85
+SHARED_DATE_SHARE = 0.05
+
+EPOCH = datetime(2026, 1, 1)
+
+VOCABULARY = {
+    "en": (
+        "audit", "analysis", "financial", "risk", "model", "market", "data", "process",
+        "control", "system", "report", "value", "capital", "asset", "portfolio", "return",
+        "volatility", "liquidity", "regulation", "compliance", "accounting", "revenue",
+        "forecast", "budget", "investment", "strategy", "performance", "statistics",
+        "automation", "python", "dashboard", "insight", "quarter", "balance", "ledger",
+        "valuation", "pricing", "derivative", "interest", "inflation", "company", "team",
+        "improvement", "efficiency", "measurement", "nanotechnology", "research", "result",
+        "method", "sample", "evidence", "review", "client", "standard", "framework",
+    ),
+    "no": (
+        "revisjon", "analyse", "finansiell", "risiko", "modell", "marked", "data", "prosess",
+        "kontroll", "system", "rapport", "verdi", "kapital", "eiendel", "portefølje", "avkastning",
+        "volatilitet", "likviditet", "regulering", "etterlevelse", "regnskap", "inntekt",
+        "prognose", "budsjett", "investering", "strategi", "ytelse", "statistikk",
+        "automatisering", "python", "dashbord", "innsikt", "kvartal", "balanse", "hovedbok",
+        "verdsettelse", "prising", "derivat", "rente", "inflasjon", "selskap", "team",
+        "forbedring", "effektivitet", "måling", "nanoteknologi", "forskning", "resultat",
+        "metode", "utvalg", "bevis", "gjennomgang", "klient", "standard", "rammeverk",
+    ),
+}
+
+# Short words mixed in so sentences have a natural stopword share
+FILLERS = {
+    "en": ("the", "a", "of", "and", "in", "to", "for", "with", "on", "is", "this", "that"),
+    "no": ("og", "i", "det", "at", "en", "et", "til", "er", "som", "på", "med", "av"),
+}
+
+CATEGORIES = {
+    "en": ("Finance", "Audit", "Data Analysis", "Technology", "Career"),
+    "no": ("Finans", "Revisjon", "Dataanalyse", "Teknologi", "Karriere"),
+}
+
+TECHNOLOGIES = (
+    "Python", "Pandas", "NumPy", "SQL", "R", "Excel", "VBA", "Power BI", "Plotly",
+    "Streamlit", "FastAPI", "React", "MongoDB", "Docker", "scikit-learn", "MATLAB",
+)
+
+FIRST_NAMES = ("Ola", "Kari", "Emma", "Noah", "Nora", "Jakob", "Sofie", "Lucas", "Ingrid", "Emil")
+LAST_NAMES = ("Hansen", "Johansen", "Olsen", "Larsen", "Andersen", "Pedersen", "Nilsen", "Berg")
+DOMAINS = ("example.com", "example.no", "example.org", "mail.example.net")
+
+def new_id(rng):
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+def slugify(text):
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+class TextGenerator:
+    """Sentences and paragraphs of plausible length in one language"""
+
+    def __init__(self, rng, lang):
+        self.rng = rng
+        self.words = VOCABULARY[lang]
+        self.fillers = FILLERS[lang]
+
+    def _words(self, count):
+        return [
+            self.rng.choice(self.fillers if self.rng.random() < 0.35 else self.words)
+            for _ in range(count)
+        ]
+
+    def title(self, low=3, high=8):
+        return " ".join(self.rng.sample(self.words, self.rng.randint(low, high))).capitalize()
+
+    def sentence(self, low=8, high=22):
+        return " ".join(self._words(self.rng.randint(low, high))).capitalize() + "."
+
+    def paragraph(self, low=3, high=7):
+        return " ".join(self.sentence() for _ in range(self.rng.randint(low, high)))
+
+    def text(self, paragraphs_low, paragraphs_high):
+        return "\n\n".join(
+            self.paragraph() for _ in range(self.rng.randint(paragraphs_low, paragraphs_high))
+        )
+
+def bilingual(texts, build):
+    """Build one field in both languages from per-language text generators"""
+    return {lang: build(text) for lang, text in texts.items()}
+
+def generate_blog_posts(count, seed):
+    rng = random.Random(f"{seed}:blog_posts")
+    texts = {lang: TextGenerator(rng, lang) for lang in VOCABULARY}
+    shared_date = None
+    for index in range(count):
+        title = bilingual(texts, lambda text: text.title())
+        category = rng.randrange(len(CATEGORIES["en"]))
+        published = rng.random() < PUBLISHED_SHARE
+        created_at = EPOCH - timedelta(minutes=rng.randrange(5 * 365 * 24 * 60))
+
+        published_at = None
+        if published:
+            if shared_date is not None and rng.random() < SHARED_DATE_SHARE:
+                published_at = shared_date
+            else:
+                published_at = shared_date = created_at + timedelta(hours=rng.randrange(72))
+
+        content = bilingual(texts, lambda text: text.text(6, 20))
+        yield {
+            "id": new_id(rng),
+            "title": title,
+            "excerpt": bilingual(texts, lambda text: text.sentence(15, 30)),
+            "content": content,
+            "slug": {lang: f"{slugify(value)}-{index}" for lang, value in title.items()},
+            "category": {lang: names[category] for lang, names in CATEGORIES.items()},
+            "read_time": f"{max(1, len(content['en'].split()) // 200)} min",
+            "published": published,
+            "published_at": published_at,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+def generate_projects(count, seed):
+    rng = random.Random(f"{seed}:projects")
+    texts = {lang: TextGenerator(rng, lang) for lang in VOCABULARY}
+    for index in range(count):
+        title = bilingual(texts, lambda text: text.title(2, 5))
+        yield {
+            "id": new_id(rng),
+            "title": title,
+            "description": bilingual(texts, lambda text: text.sentence(10, 30)),
+            "technologies": rng.sample(TECHNOLOGIES, rng.randint(2, 6)),
+            "github": f"https://github.com/example/{slugify(title['en'])}-{index}",
+            "live_url": f"https://{slugify(title['en'])}-{index}.example.com" if rng.random() < 0.3 else None,
+            "featured": rng.random() < 0.2,
+            "order": index,
+            "created_at": EPOCH - timedelta(days=rng.randrange(5 * 365)),
+        }
+
+def generate_timeline(count, seed):
+    rng = random.Random(f"{seed}:timeline")
+    texts = {lang: TextGenerator(rng, lang) for lang in VOCABULARY}
+    for index in range(count):
+        start = 2026 - rng.randrange(30)
+        yield {
+            "id": new_id(rng),
+            "year": f"{start}–{start + rng.randint(1, 4)}",
+            "title": bilingual(texts, lambda text: text.title(1, 3)),
+            "company": bilingual(texts, lambda text: text.title(1, 2)),
+            "description": bilingual(texts, lambda text: text.sentence(4, 14)),
+            "order": index,
+            "created_at": EPOCH - timedelta(days=rng.randrange(365)),
+        }
+
+def generate_contacts(count, seed):
+    rng = random.Random(f"{seed}:contacts")
+    texts = {lang: TextGenerator(rng, lang) for lang in VOCABULARY}
+    for index in range(count):
+        text = texts[rng.choice(("en", "no"))]
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        yield {
+            "id": new_id(rng),
+            "name": f"{first} {last}",
+            "email": f"{first}.{last}.{index}@{rng.choice(DOMAINS)}".lower(),
+            "subject": text.title(2, 6),
+            "message": text.paragraph(1, 5),
+            "read": rng.random() < 0.6,
+            "submitted_at": EPOCH - timedelta(seconds=rng.randrange(3 * 365 * 24 * 3600)),
+        }
+
+def generate_subscribers(count, seed):
+    rng = random.Random(f"{seed}:newsletter")
+    for index in range(count):
+        subscribed_at = EPOCH - timedelta(seconds=rng.randrange(3 * 365 * 24 * 3600))
+        subscribed = rng.random() < 0.9
+        yield {
+            "id": new_id(rng),
+            "email": f"reader{index}.{rng.choice(LAST_NAMES)}@{rng.choice(DOMAINS)}".lower(),
+            "subscribed": subscribed,
+            "subscribed_at": subscribed_at,
+            "unsubscribed_at": None if subscribed else subscribed_at + timedelta(days=rng.randrange(1, 365)),
+        }
+
+GENERATORS = {
+    "blog_posts": generate_blog_posts,
+    "projects": generate_projects,
+    "timeline": generate_timeline,
+    "contacts": generate_contacts,
+    "newsletter": generate_subscribers,
+}
+
+# Collections with materialized views and content revisions
+CONTENT_NAMESPACES = {"blog_posts": "blog", "projects": "projects", "timeline": "timeline"}
+
+async def insert_batches(collection, documents, semaphore, batch_size=GENERATE_BATCH_SIZE):
+    """Insert generated documents with concurrent, bounded insert_many batches
+
+    A slot of ``semaphore`` is taken before each batch is handed off, so
+    generation waits for inserts and at most one batch per slot (plus the
+    one being built) is held in memory.
+    """
+    async def insert(batch):
+        try:
+            await db[collection].insert_many(batch, ordered=False)
+        finally:
+            semaphore.release()
+
+    async def submit(batch):
+        await semaphore.acquire()
+        tasks.append(asyncio.create_task(insert(batch)))
+
+    tasks = []
+    batch = []
+    for document in documents:
+        batch.append(document)
+        if len(batch) == batch_size:
+            await submit(batch)
+            batch = []
+    if batch:
+        await submit(batch)
+    await asyncio.gather(*tasks)
+
+async def generate(counts, seed=0, clear=False, concurrency=GENERATE_CONCURRENCY):
+    """Insert ``counts[collection]`` synthetic documents per collection
+
+    Views and content revisions of the touched content collections are
+    rebuilt and bumped afterwards. Returns the number of inserted
+    documents per collection.
+    """
+    counts = {collection: count for collection, count in counts.items() if count}
+    if clear:
+        for collection in counts:
+            await db[collection].delete_many({})
+
+    semaphore = asyncio.Semaphore(concurrency)
+    await asyncio.gather(*(
+        insert_batches(collection, GENERATORS[collection](count, seed), semaphore)
+        for collection, count in counts.items()
+    ))
+
+    for collection in counts:
+        if collection in CONTENT_NAMESPACES:
+            await materializer.rebuild(collection)
+            await revisions.bump(CONTENT_NAMESPACES[collection])
+    return counts
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=0, help="Blog posts to generate")
+    parser.add_argument("--projects", type=int, default=0, help="Projects to generate")
+    parser.add_argument("--timeline", type=int, default=0, help="Timeline entries to generate")
+    parser.add_argument("--contacts", type=int, default=0, help="Contact submissions to generate")
+    parser.add_argument("--subscribers", type=int, default=0, help="Newsletter subscribers to generate")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated dataset")
+    parser.add_argument("--clear", action="store_true", help="Empty the generated collections first")
+    parser.add_argument("--concurrency", type=int, default=GENERATE_CONCURRENCY,
+                        help="insert_many batches in flight")
+    return parser.parse_args(argv)
+
+def counts_from_args(args):
+    return {
+        "blog_posts": args.posts,
+        "projects": args.projects,
+        "timeline": args.timeline,
+        "contacts": args.contacts,
+        "newsletter": args.subscribers,
+    }
+
+async def main(argv=None):
+    args = parse_args(argv)
+    started = time.perf_counter()
+    inserted = await generate(counts_from_args(args), args.seed, args.clear, args.concurrency)
+    for collection, count in inserted.items():
+        print(f"✅ {count} {collection} document(s) inserted")
+    print(f"🎉 Synthetic data generated in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    asyncio.run(main())
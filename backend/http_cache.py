@@ -0,0 +1,87 @@
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request, Response
+import hashlib
+import revisions
+
+# Suffixes distinguishing the ETags of compressed representations
+ENCODING_SUFFIXES = ("-br", "-gzip")
+
+def _http_date(value):
+    return format_datetime(value.replace(microsecond=0, tzinfo=timezone.utc), usegmt=True)
+
+def validators(namespace, key):
+    """Return (etag, last_modified) for a cached response, or None if unknown
+
+    ``namespace`` may be a tuple for responses combining several namespaces.
+    """
+    namespaces = (namespace,) if isinstance(namespace, str) else tuple(namespace)
+    current = [revisions.current(name) for name in namespaces]
+    if any(revision is None for revision in current):
+        return None
+
+    fingerprint = repr((
+        namespaces,
+        [(rev, updated_at.isoformat()) for rev, updated_at in current],
+        key
+    )).encode()
+    etag = '"' + hashlib.sha1(fingerprint).hexdigest()[:20] + '"'
+    return etag, max(updated_at for _, updated_at in current)
+
+def encoded_etag(etag, encoding):
+    """Derive the strong ETag of a compressed representation"""
+    return f'{etag[:-1]}-{encoding}"'
+
+def _base_tag(tag):
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    for suffix in ENCODING_SUFFIXES:
+        if tag.endswith(suffix + '"'):
+            return tag[:-len(suffix) - 1] + '"'
+    return tag
+
+def not_modified_etag(request: Request, etag, last_modified):
+    """Evaluate If-None-Match, falling back to If-Modified-Since
+
+    Returns the ETag a 304 should carry, or None if the client's copy is
+    out of date. For If-None-Match that is the client's own matching tag,
+    so caches holding a compressed variant (``"…-br"``) can match the 304
+    to their stored response.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        for tag in if_none_match.split(","):
+            if _base_tag(tag) == etag:
+                return tag.strip()
+        return None
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return None
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        if last_modified.replace(microsecond=0, tzinfo=timezone.utc) <= since:
+            return etag
+
+    return None
+
+def conditional(request: Request, namespace, key):
+    """Return (validator headers, 304 response or None) for a content request"""
+    current = validators(namespace, key)
+    if current is None:
+        return {}, None
+
+    etag, last_modified = current
+    headers = {"ETag": etag, "Last-Modified": _http_date(last_modified)}
+    matched = not_modified_etag(request, etag, last_modified)
+    if matched is not None:
+        return headers, Response(
+            status_code=304,
+            headers={**headers, "ETag": matched, "Vary": "Accept-Encoding"}
+        )
+
+    return headers, None
@@ -0,0 +1,125 @@
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+from database import db
+import asyncio
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
+
+PUBLISHED = {"published": True}
+HAS_ID = {"id": {"$exists": True}}
+
+# Declarative index registry: collection -> indexes its queries rely on.
+# Index names are explicit so presence can be checked without comparing keys.
+INDEXES = {
+    # Upsert keys of the bulk endpoints (see bulk.py)
+    "timeline": [
+        IndexModel([("id", ASCENDING)], name="id", unique=True, partialFilterExpression=HAS_ID),
+    ],
+    "projects": [
+        IndexModel([("id", ASCENDING)], name="id", unique=True, partialFilterExpression=HAS_ID),
+    ],
+    "blog_posts": [
+        IndexModel([("id", ASCENDING)], name="id", unique=True, partialFilterExpression=HAS_ID),
+        IndexModel(
+            [("slug.en", ASCENDING)],
+            name="slug_en",
+            unique=True,
+            partialFilterExpression={"slug.en": {"$exists": True}}
+        ),
+    ],
+    "portfolio_views": [
+        IndexModel([("source_id", ASCENDING), ("lang", ASCENDING)], name="source_lang", unique=True),
+        IndexModel([("lang", ASCENDING)], name="lang"),
+    ],
+    "timeline_views": [
+        IndexModel([("source_id", ASCENDING), ("lang", ASCENDING)], name="source_lang", unique=True),
+        IndexModel([("lang", ASCENDING), ("order", DESCENDING)], name="lang_order"),
+    ],
+    "project_views": [
+        IndexModel([("source_id", ASCENDING), ("lang", ASCENDING)], name="source_lang", unique=True),
+        IndexModel([("lang", ASCENDING), ("order", ASCENDING)], name="lang_order"),
+        IndexModel(
+            [("lang", ASCENDING), ("order", ASCENDING)],
+            name="lang_featured_order",
+            partialFilterExpression={"featured": True}
+        ),
+    ],
+    "blog_post_views": [
+        IndexModel([("source_id", ASCENDING), ("lang", ASCENDING)], name="source_lang", unique=True),
+        IndexModel(
+            [("lang", ASCENDING), ("published_at", DESCENDING), ("_id", DESCENDING)],
+            name="published_listing",
+            partialFilterExpression=PUBLISHED
+        ),
+        IndexModel(
+            [("lang", ASCENDING), ("slug", ASCENDING)],
+            name="published_slug",
+            partialFilterExpression=PUBLISHED
+        ),
+    ],
+    "contacts": [
+        IndexModel(
+            [("id", ASCENDING)],
+            name="id",
+            unique=True,
+            partialFilterExpression=HAS_ID
+        ),
+        IndexModel([("submitted_at", DESCENDING), ("_id", DESCENDING)], name="submitted_listing"),
+    ],
+    "newsletter": [
+        IndexModel([("email", ASCENDING)], name="email", unique=True),
+        IndexModel(
+            [("subscribed", ASCENDING), ("subscribed_at", DESCENDING), ("_id", DESCENDING)],
+            name="subscribed_listing"
+        ),
+    ],
+}
+
+async def ensure_indexes(create=True):
+    """Create any missing registry indexes and report what was found
+
+    Returns a dict with ``created``, ``present`` and ``missing`` lists of
+    ``collection.index`` names. Indexes that cannot be built (e.g. a unique
+    index over existing duplicates) are logged and reported as missing.
+    """
+    report = {"created": [], "present": [], "missing": []}
+
+    for collection, indexes in INDEXES.items():
+        existing = await db[collection].index_information()
+        for index in indexes:
+            name = index.document["name"]
+            label = f"{collection}.{name}"
+
+            if name in existing:
+                report["present"].append(label)
+                continue
+
+            if not create:
+                report["missing"].append(label)
+                continue
+
+            try:
+                await db[collection].create_indexes([index])
+                report["created"].append(label)
+            except OperationFailure as e:
+                logger.error(f"Error creating index {label}: {str(e)}")
+                report["missing"].append(label)
+
+    logger.info(
+        f"Indexes: {len(report['created'])} created, "
+        f"{len(report['present'])} present, {len(report['missing'])} missing"
+    )
+    for label in report["missing"]:
+        logger.warning(f"Missing index: {label}")
+
+    return report
+
+if __name__ == "__main__":
+    # python indexes.py [--check]  (--check reports without creating)
+    logging.basicConfig(level=logging.INFO)
+    result = asyncio.run(ensure_indexes(create="--check" not in sys.argv))
+    for status, labels in result.items():
+        for label in labels:
+            print(f"{status}: {label}")
@@ -0,0 +1,125 @@
+from pymongo.errors import OperationFailure, PyMongoError
+from database import db
+from search_index import search_index
+import asyncio
+import logging
+import os
+import revisions
+
+logger = logging.getLogger(__name__)
+
+# "auto" (change streams, polling when unsupported), "changestream", "poll" or "off"
+INVALIDATION_MODE = os.environ.get('INVALIDATION_MODE', 'auto').lower()
+INVALIDATION_POLL_SECONDS = float(os.environ.get('INVALIDATION_POLL_SECONDS', '2'))
+INVALIDATION_RETRY_SECONDS = float(os.environ.get('INVALIDATION_RETRY_SECONDS', '5'))
+
+# Namespaces the in-process search index is built from
+SEARCH_NAMESPACES = ("blog", "projects")
+
+# Server error returned by $changeStream on a standalone mongod
+CHANGE_STREAMS_UNSUPPORTED = 40573
+
+class InvalidationWatcher:
+    """Apply content changes made by other workers to this process
+
+    Every write path materializes its views and then bumps the namespace
+    revision, so the ``revisions`` collection is the point at which new
+    content is complete. Watching it (rather than the source collections,
+    whose events arrive before the views are rewritten) invalidates the
+    local content cache, advances the ETag revisions and refreshes the
+    search index without ever re-caching old views. A standalone mongod
+    has no change streams; the collection is then polled instead.
+    """
+
+    def __init__(self, mode=INVALIDATION_MODE, poll_interval=INVALIDATION_POLL_SECONDS):
+        self.mode = mode
+        self.poll_interval = poll_interval
+        self._task = None
+        self._search_refresh = None
+        self._search_stale = False
+
+    async def start(self):
+        if self.mode == "off":
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        for task in (self._task, self._search_refresh):
+            if task is not None:
+                task.cancel()
+                # Also swallows the error of a task that already failed
+                await asyncio.gather(task, return_exceptions=True)
+        self._task = self._search_refresh = None
+
+    def _apply(self, document):
+        """Apply one revision document; return True if it was news to this worker"""
+        if not revisions.apply(document):
+            return False
+        logger.info(f"Content changed elsewhere: {document['_id']} is now at revision {document['rev']}")
+        if document["_id"] in SEARCH_NAMESPACES:
+            self._refresh_search()
+        return True
+
+    def _refresh_search(self):
+        # Changes arriving during a rebuild trigger one more rebuild, not one each
+        self._search_stale = True
+        if self._search_refresh is None or self._search_refresh.done():
+            self._search_refresh = asyncio.create_task(self._rebuild_search())
+
+    async def _rebuild_search(self):
+        while self._search_stale:
+            self._search_stale = False
+            try:
+                await search_index.rebuild()
+            except Exception as e:
+                logger.error(f"Error refreshing the search index: {str(e)}")
+
+    async def poll(self):
+        """Compare every stored revision with the local ones"""
+        async for document in db.revisions.find({"_id": {"$in": list(revisions.CONTENT_NAMESPACES)}}):
+            self._apply(document)
+
+    async def _watch(self):
+        resume_token = None
+        while True:
+            try:
+                async with db.revisions.watch(
+                    [{"$match": {"operationType": {"$in": ["insert", "update", "replace"]}}}],
+                    full_document="updateLookup",
+                    resume_after=resume_token
+                ) as stream:
+                    # Catch up on anything that changed before the stream opened
+                    await self.poll()
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        if change.get("fullDocument"):
+                            self._apply(change["fullDocument"])
+            except OperationFailure as e:
+                if e.code == CHANGE_STREAMS_UNSUPPORTED:
+                    raise
+                logger.error(f"Error watching content revisions: {str(e)}")
+                resume_token = None
+            except PyMongoError as e:
+                logger.error(f"Error watching content revisions: {str(e)}")
+            await asyncio.sleep(INVALIDATION_RETRY_SECONDS)
+
+    async def _poll_forever(self):
+        while True:
+            try:
+                await self.poll()
+            except Exception as e:
+                logger.error(f"Error polling content revisions: {str(e)}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _run(self):
+        if self.mode in ("auto", "changestream"):
+            try:
+                await self._watch()
+            except (OperationFailure, NotImplementedError, AttributeError) as e:
+                if self.mode == "changestream":
+                    logger.error(f"Change streams unavailable, content invalidation disabled: {str(e)}")
+                    return
+                logger.info("Change streams unavailable, polling content revisions instead")
+        await self._poll_forever()
+
+invalidation_watcher = InvalidationWatcher()
@@ -0,0 +1,237 @@
+from pymongo import ReplaceOne
+from database import db
+from models.localized import LANGUAGES
+from search_index import search_index
+import profiling
+import revisions
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Source fields each renderer reads, so rebuilds skip everything else
+SOURCE_FIELDS = {
+    "portfolio": ["personal_info", "home", "about"],
+    "timeline": ["year", "title", "company", "description", "order"],
+    "projects": ["title", "description", "technologies", "github", "live_url", "featured", "order"],
+    "blog_posts": [
+        "title", "excerpt", "content", "slug", "category", "read_time",
+        "published", "published_at", "created_at"
+    ],
+}
+
+# Number of view documents written per bulk_write during a rebuild
+REBUILD_BATCH_SIZE = 500
+
+# Raised by the renderers for source documents missing fields they read
+RENDER_ERRORS = (KeyError, TypeError, AttributeError)
+
+def projection(*fields, include_id=False):
+    """Build an inclusion projection for the given view fields"""
+    fields_projection = {"_id": 1 if include_id else 0}
+    fields_projection.update({field: 1 for field in fields})
+    return fields_projection
+
+def response_fields(model, *extra, include_id=False):
+    """Projection reading exactly the fields a response model serializes"""
+    return projection(*model.model_fields, *extra, include_id=include_id)
+
+def _format_date(value):
+    return value.strftime("%Y-%m-%d") if value else None
+
+def render_portfolio(portfolio, lang):
+    """Render the portfolio document for one language"""
+    return {
+        "personal": {
+            "name": portfolio["personal_info"]["name"],
+            "title": portfolio["personal_info"]["title"][lang],
+            "email": portfolio["personal_info"]["email"],
+            "linkedin": portfolio["personal_info"]["linkedin"],
+            "github": portfolio["personal_info"]["github"],
+            "profileImage": portfolio["personal_info"]["profile_image"],
+            "birthdate": portfolio["personal_info"]["birthdate"]
+        },
+        "home": portfolio["home"][lang],
+        "about": {
+            "education": [
+                {
+                    "degree": item["degree"],
+                    "institution": item["institution"],
+                    "period": item["period"],
+                    "thesis": item.get("thesis")
+                }
+                for item in portfolio["about"]["education"][lang]
+            ],
+            "skills": portfolio["about"]["skills"][lang],
+            "languages": portfolio["about"]["languages"][lang],
+            "interests": portfolio["about"]["interests"][lang]
+        }
+    }
+
+def render_timeline_item(item, lang):
+    """Render a timeline item for one language, keeping its sort order"""
+    return {
+        "year": item["year"],
+        "title": item["title"][lang],
+        "company": item["company"][lang],
+        "description": item["description"][lang],
+        "order": item["order"]
+    }
+
+def render_project(project, lang):
+    """Render a project for one language, keeping its filter and sort fields"""
+    return {
+        "title": project["title"][lang],
+        "description": project["description"][lang],
+        "technologies": project["technologies"],
+        "github": project["github"],
+        "live_url": project.get("live_url"),
+        "featured": project.get("featured", False),
+        "order": project.get("order", 0)
+    }
+
+def render_blog_post(post, lang):
+    """Render a blog post for one language, keeping its filter and sort fields
+
+    ``published_at`` falls back to ``created_at`` so every view has a
+    non-null sort key for keyset pagination.
+    """
+    return {
+        "title": post["title"][lang],
+        "excerpt": post["excerpt"][lang],
+        "content": post["content"][lang],
+        "date": _format_date(post.get("published_at") or post.get("created_at")),
+        "slug": post["slug"][lang],
+        "category": post["category"][lang],
+        "read_time": post["read_time"],
+        "published": post.get("published", False),
+        "published_at": post.get("published_at") or post.get("created_at")
+    }
+
+# Source collection -> (view collection, renderer)
+VIEWS = {
+    "portfolio": ("portfolio_views", render_portfolio),
+    "timeline": ("timeline_views", render_timeline_item),
+    "projects": ("project_views", render_project),
+    "blog_posts": ("blog_post_views", render_blog_post),
+}
+
+# Source collection -> content revision namespace (see revisions.py)
+NAMESPACES = {"portfolio": "portfolio", "timeline": "timeline", "projects": "projects", "blog_posts": "blog"}
+
+def _render_views(collection, document):
+    _, render = VIEWS[collection]
+    views = []
+    with profiling.phase("transform"):
+        for lang in LANGUAGES:
+            view = render(document, lang)
+            view["source_id"] = document["_id"]
+            view["lang"] = lang
+            views.append(view)
+    return views
+
+def render_error(collection, document):
+    """Return why a source document cannot be rendered, or None if it can"""
+    try:
+        _render_views(collection, {**document, "_id": None})
+    except RENDER_ERRORS as e:
+        return f"Cannot render {collection} document: {e!r}"
+    return None
+
+def _view_operations(views):
+    return [
+        ReplaceOne({"source_id": view["source_id"], "lang": view["lang"]}, view, upsert=True)
+        for view in views
+    ]
+
+async def materialize(collection, document):
+    """Render and store every language projection of a single source document"""
+    view_name, _ = VIEWS[collection]
+    views = _render_views(collection, document)
+    await db[view_name].bulk_write(_view_operations(views), ordered=False)
+
+    # Keep the search index in step with the views it is built from
+    for view in views:
+        search_index.index_view(collection, view)
+
+async def materialize_many(collection, documents):
+    """Render and store the views of many source documents in one bulk write"""
+    view_name, _ = VIEWS[collection]
+    views = [view for document in documents for view in _render_views(collection, document)]
+    if not views:
+        return
+    await db[view_name].bulk_write(_view_operations(views), ordered=False)
+
+    for view in views:
+        search_index.index_view(collection, view)
+
+async def _write_views(view_name, operations):
+    """Write view upserts; return how many views were created or changed"""
+    result = await db[view_name].bulk_write(operations, ordered=False)
+    return result.upserted_count + result.modified_count
+
+async def _drop_orphans(collection, view_name, source_ids):
+    """Delete views whose source document no longer exists; return how many
+
+    Sources are checked again rather than trusting the rebuild's snapshot,
+    so views another worker materialized during the rebuild are kept.
+    """
+    candidates = [
+        source_id for source_id in await db[view_name].distinct("source_id")
+        if source_id not in source_ids
+    ]
+    if not candidates:
+        return 0
+    existing = {
+        document["_id"]
+        async for document in db[collection].find({"_id": {"$in": candidates}}, {"_id": 1})
+    }
+    orphans = [source_id for source_id in candidates if source_id not in existing]
+    if not orphans:
+        return 0
+    result = await db[view_name].delete_many({"source_id": {"$in": orphans}})
+    return result.deleted_count
+
+async def rebuild(collection):
+    """Re-render all views for a source collection and drop orphaned ones
+
+    Documents that cannot be rendered (e.g. a missing translation) are
+    logged and keep whatever views they had, so one bad document does not
+    stop the rebuild.
+
+    Views that come out different (sources edited outside the API, or a
+    renderer that changed in a deploy) bump the namespace revision, so
+    ETags change with the content.
+    """
+    view_name, _ = VIEWS[collection]
+    source_ids = set()
+    operations = []
+    rendered = 0
+    changed = 0
+
+    async for document in db[collection].find({}, projection(*SOURCE_FIELDS[collection], include_id=True)):
+        source_ids.add(document["_id"])
+        try:
+            views = _render_views(collection, document)
+        except RENDER_ERRORS as e:
+            logger.error(f"Skipped rendering {collection} document {document['_id']}: {e!r}")
+            continue
+        rendered += 1
+        operations.extend(_view_operations(views))
+        if len(operations) >= REBUILD_BATCH_SIZE:
+            changed += await _write_views(view_name, operations)
+            operations = []
+
+    if operations:
+        changed += await _write_views(view_name, operations)
+
+    changed += await _drop_orphans(collection, view_name, source_ids)
+    if changed:
+        logger.info(f"Rebuild changed {changed} {collection} view(s)")
+        await revisions.bump(NAMESPACES[collection])
+    return rendered
+
+async def rebuild_all():
+    """Rebuild every materialized view, used at startup and after seeding"""
+    for collection in VIEWS:
+        count = await rebuild(collection)
+        logger.info(f"Materialized {count} {collection} document(s)")
@@ -0,0 +1,188 @@
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, REGISTRY
+from pymongo import monitoring
+from starlette.datastructures import QueryParams
+from cache import content_cache
+import threading
+import time
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route, language and status",
+    ["method", "route", "lang", "status"]
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route and language",
+    ["method", "route", "lang"],
+    buckets=LATENCY_BUCKETS
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served"
+)
+MONGO_COMMAND_LATENCY = Histogram(
+    "mongodb_command_duration_seconds",
+    "MongoDB command duration by command and outcome",
+    ["command", "outcome"],
+    buckets=LATENCY_BUCKETS
+)
+MONGO_POOL_WAIT = Histogram(
+    "mongodb_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the pool",
+    buckets=LATENCY_BUCKETS
+)
+MONGO_POOL_CHECKOUT_FAILURES = Counter(
+    "mongodb_pool_checkout_failures_total",
+    "Connection checkouts that failed, by reason",
+    ["reason"]
+)
+MONGO_CONNECTIONS_IN_USE = Gauge(
+    "mongodb_pool_connections_in_use",
+    "Connections currently checked out of the pool"
+)
+
+def route_label(scope):
+    """Route template of a request ("unmatched" for 404s, to bound cardinality)"""
+    route = scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+def lang_label(scope):
+    lang = QueryParams(scope.get("query_string", b"").decode("latin-1")).get("lang")
+    return lang if lang in ("en", "no") else ""
+
+class MetricsMiddleware:
+    """Record request count, latency and in-flight requests per route and lang"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        REQUESTS_IN_PROGRESS.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            REQUESTS_IN_PROGRESS.dec()
+            route, lang = route_label(scope), lang_label(scope)
+            REQUESTS.labels(scope["method"], route, lang, str(status)).inc()
+            REQUEST_LATENCY.labels(scope["method"], route, lang).observe(elapsed)
+
+class CommandTimer(monitoring.CommandListener):
+    """Time every MongoDB command (pymongo reports the duration itself)"""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        MONGO_COMMAND_LATENCY.labels(event.command_name, "success").observe(event.duration_micros / 1e6)
+
+    def failed(self, event):
+        MONGO_COMMAND_LATENCY.labels(event.command_name, "failure").observe(event.duration_micros / 1e6)
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Measure how long operations wait for a pooled connection
+
+    Checkout events carry no correlation id, but a checkout starts and
+    completes on the same (motor executor) thread, so the start time is
+    kept in a thread-local.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def _waited(self):
+        started = getattr(self._local, "started", None)
+        self._local.started = None
+        return None if started is None else time.perf_counter() - started
+
+    def connection_checked_out(self, event):
+        waited = self._waited()
+        if waited is not None:
+            MONGO_POOL_WAIT.observe(waited)
+        MONGO_CONNECTIONS_IN_USE.inc()
+
+    def connection_check_out_failed(self, event):
+        self._waited()
+        MONGO_POOL_CHECKOUT_FAILURES.labels(event.reason).inc()
+
+    def connection_checked_in(self, event):
+        MONGO_CONNECTIONS_IN_USE.dec()
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        pass
+
+class CacheCollector:
+    """Expose the content cache counters at scrape time"""
+
+    def collect(self):
+        yield CounterMetricFamily("content_cache_hits", "Content cache hits", value=content_cache.hits)
+        yield CounterMetricFamily("content_cache_misses", "Content cache misses", value=content_cache.misses)
+        yield CounterMetricFamily(
+            "content_cache_coalesced",
+            "Content cache misses that joined an in-flight load",
+            value=content_cache.coalesced
+        )
+        yield CounterMetricFamily(
+            "content_cache_refreshes",
+            "Background reloads of content cache entries nearing expiry",
+            value=content_cache.refreshes
+        )
+        yield CounterMetricFamily(
+            "content_cache_refresh_failures",
+            "Background reloads that failed and kept the cached value",
+            value=content_cache.refresh_failures
+        )
+        yield CounterMetricFamily(
+            "content_cache_stale_served",
+            "Failed loads answered with an expired or invalidated value",
+            value=content_cache.stale_served
+        )
+        lookups = content_cache.hits + content_cache.misses
+        yield GaugeMetricFamily(
+            "content_cache_hit_ratio",
+            "Share of content cache lookups served from the cache",
+            value=content_cache.hits / lookups if lookups else 0.0
+        )
+        yield GaugeMetricFamily("content_cache_entries", "Entries held by the content cache", value=len(content_cache))
+
+REGISTRY.register(CacheCollector())
+
+# Listeners passed to the MongoDB client (see database.py)
+MONGO_LISTENERS = [CommandTimer(), PoolMonitor()]
@@ -1,15 +1,16 @@
 from pydantic import BaseModel, Field
-from typing import Dict, Optional
+from typing import List, Literal, Optional
 from datetime import datetime
+from models.localized import LocalizedStr
 import uuid
 
 class BlogPost(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    title: Dict[str, str]  # {"en": "...", "no": "..."}
-    excerpt: Dict[str, str]
-    content: Dict[str, str]
-    slug: Dict[str, str]
-    category: Dict[str, str]
+    title: LocalizedStr
+    excerpt: LocalizedStr
+    content: LocalizedStr
+    slug: LocalizedStr
+    category: LocalizedStr
     read_time: str
     published: bool = False
     published_at: Optional[datetime] = None
@@ -17,14 +18,25 @@ class BlogPost(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 class BlogPostCreate(BaseModel):
-    title: Dict[str, str]
-    excerpt: Dict[str, str]
-    content: Dict[str, str]
-    slug: Dict[str, str]
-    category: Dict[str, str]
+    title: LocalizedStr
+    excerpt: LocalizedStr
+    content: LocalizedStr
+    slug: LocalizedStr
+    category: LocalizedStr
     read_time: str
     published: bool = False
 
+class BlogPostUpsert(BlogPostCreate):
+    id: Optional[str] = None
+    # Original publish date when migrating posts; kept as stored when omitted
+    published_at: Optional[datetime] = None
+
+class BlogPostBulkCreate(BaseModel):
+    items: List[BlogPostUpsert]
+    ordered: bool = False
+    # Match existing posts by id or by English slug
+    upsert_by: Literal["id", "slug"] = "slug"
+
 class BlogPostResponse(BaseModel):
     title: str
     excerpt: str
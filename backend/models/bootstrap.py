@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+from models.timeline import TimelineResponse
+from models.project import ProjectResponse
+from models.blog import BlogPostResponse
+
+class BootstrapResponse(BaseModel):
+    portfolio: Dict[str, Any]
+    timeline: List[TimelineResponse]
+    projects: List[ProjectResponse]
+    blog: List[BlogPostResponse]
+    blog_next_cursor: Optional[str] = None
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, EmailStr
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 import uuid
 
@@ -12,11 +12,16 @@ class Contact(BaseModel):
     read: bool = False
     submitted_at: datetime = Field(default_factory=datetime.utcnow)
 
+# Field limits keep submissions well under MongoDB's 16 MB document limit
+CONTACT_NAME_MAX_LENGTH = 200
+CONTACT_SUBJECT_MAX_LENGTH = 300
+CONTACT_MESSAGE_MAX_LENGTH = 10000
+
 class ContactCreate(BaseModel):
-    name: str
+    name: str = Field(..., max_length=CONTACT_NAME_MAX_LENGTH)
     email: EmailStr
-    subject: str
-    message: str
+    subject: str = Field(..., max_length=CONTACT_SUBJECT_MAX_LENGTH)
+    message: str = Field(..., max_length=CONTACT_MESSAGE_MAX_LENGTH)
 
 class Newsletter(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -26,4 +31,7 @@ class Newsletter(BaseModel):
     unsubscribed_at: Optional[datetime] = None
 
 class NewsletterCreate(BaseModel):
-    email: EmailStr
\ No newline at end of file
+    email: EmailStr
+
+class NewsletterBulkCreate(BaseModel):
+    emails: List[EmailStr]
\ No newline at end of file
@@ -0,0 +1,18 @@
+from pydantic import AfterValidator
+from typing import Annotated, Dict, List
+
+# Languages every content document must be written in
+LANGUAGES = ("en", "no")
+
+def _require_languages(value):
+    missing = [lang for lang in LANGUAGES if lang not in value]
+    if missing:
+        raise ValueError(f"missing translation(s) for {', '.join(missing)}")
+    return value
+
+def localized(value_type):
+    """Per-language field type, e.g. ``{"en": "...", "no": "..."}``, requiring every language"""
+    return Annotated[Dict[str, value_type], AfterValidator(_require_languages)]
+
+LocalizedStr = localized(str)
+LocalizedList = localized(List[str])
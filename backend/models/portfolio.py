@@ -1,11 +1,12 @@
 from pydantic import BaseModel, Field
 from typing import List, Dict, Optional
 from datetime import datetime
+from models.localized import LocalizedList, LocalizedStr, localized
 import uuid
 
 class PersonalInfo(BaseModel):
     name: str
-    title: Dict[str, str]  # {"en": "...", "no": "..."}
+    title: LocalizedStr
     email: str
     linkedin: str
     github: str
@@ -23,10 +24,10 @@ class EducationItem(BaseModel):
     thesis: Optional[str] = None
 
 class AboutData(BaseModel):
-    education: Dict[str, List[EducationItem]]  # {"en": [...], "no": [...]}
-    skills: Dict[str, List[str]]
-    languages: Dict[str, List[str]]
-    interests: Dict[str, List[str]]
+    education: localized(List[EducationItem])
+    skills: LocalizedList
+    languages: LocalizedList
+    interests: LocalizedList
 
 class Portfolio(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
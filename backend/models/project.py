@@ -1,12 +1,13 @@
 from pydantic import BaseModel, Field
-from typing import List, Dict, Optional
+from typing import List, Optional
 from datetime import datetime
+from models.localized import LocalizedStr
 import uuid
 
 class Project(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    title: Dict[str, str]  # {"en": "...", "no": "..."}
-    description: Dict[str, str]
+    title: LocalizedStr
+    description: LocalizedStr
     technologies: List[str]
     github: str
     live_url: Optional[str] = None
@@ -15,14 +16,21 @@ class Project(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 class ProjectCreate(BaseModel):
-    title: Dict[str, str]
-    description: Dict[str, str]
+    title: LocalizedStr
+    description: LocalizedStr
     technologies: List[str]
     github: str
     live_url: Optional[str] = None
     featured: bool = False
     order: int = 0
 
+class ProjectUpsert(ProjectCreate):
+    id: Optional[str] = None
+
+class ProjectBulkCreate(BaseModel):
+    items: List[ProjectUpsert]
+    ordered: bool = False
+
 class ProjectResponse(BaseModel):
     title: str
     description: str
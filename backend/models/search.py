@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import Optional
+
+class SearchResult(BaseModel):
+    type: str  # "blog" or "project"
+    title: str
+    snippet: str  # HTML-escaped excerpt with matches wrapped in <mark>
+    score: float
+    slug: Optional[str] = None
+    date: Optional[str] = None
+    category: Optional[str] = None
+    github: Optional[str] = None
+    live_url: Optional[str] = None
\ No newline at end of file
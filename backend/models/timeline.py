@@ -1,24 +1,32 @@
 from pydantic import BaseModel, Field
-from typing import Dict
+from typing import List, Optional
 from datetime import datetime
+from models.localized import LocalizedStr
 import uuid
 
 class Timeline(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     year: str
-    title: Dict[str, str]  # {"en": "...", "no": "..."}
-    company: Dict[str, str]
-    description: Dict[str, str]
+    title: LocalizedStr
+    company: LocalizedStr
+    description: LocalizedStr
     order: int
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 class TimelineCreate(BaseModel):
     year: str
-    title: Dict[str, str]
-    company: Dict[str, str]
-    description: Dict[str, str]
+    title: LocalizedStr
+    company: LocalizedStr
+    description: LocalizedStr
     order: int
 
+class TimelineUpsert(TimelineCreate):
+    id: Optional[str] = None
+
+class TimelineBulkCreate(BaseModel):
+    items: List[TimelineUpsert]
+    ordered: bool = False
+
 class TimelineResponse(BaseModel):
     year: str
     title: str
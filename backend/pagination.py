@@ -0,0 +1,49 @@
+from bson import ObjectId
+from bson.errors import InvalidId
+from datetime import datetime
+from fastapi import HTTPException
+import base64
+import json
+
+# Response header carrying the cursor for the next page of a listing
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(value, document_id: ObjectId) -> str:
+    """Encode a (sort value, _id) listing position as an opaque, URL-safe cursor"""
+    payload = json.dumps({"p": value.isoformat() if value else None, "i": str(document_id)})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str):
+    """Decode a cursor into (sort value, _id), raising 400 if malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value = datetime.fromisoformat(payload["p"]) if payload["p"] else None
+        return value, ObjectId(payload["i"])
+    except (ValueError, KeyError, TypeError, InvalidId):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def keyset_filter(field, position, nullable=False):
+    """Filter for documents after ``position`` in (field, _id) descending order
+
+    Documents missing ``field`` sort last; pass ``nullable=True`` for
+    collections where older documents may lack it.
+    """
+    value, document_id = position
+    if value is None:
+        return {field: None, "_id": {"$lt": document_id}}
+
+    after = [
+        {field: {"$lt": value}},
+        {field: value, "_id": {"$lt": document_id}}
+    ]
+    if nullable:
+        after.append({field: None})
+    return {"$or": after}
+
+def next_cursor(documents, limit, field):
+    """Cursor following the last document of a full page, or None"""
+    if not documents or len(documents) < limit:
+        return None
+    last = documents[-1]
+    return encode_cursor(last.get(field), last["_id"])
@@ -0,0 +1,200 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from pymongo import monitoring
+from starlette.datastructures import Headers, MutableHeaders
+import asyncio
+import cProfile
+import logging
+import orjson
+import os
+import random
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).parent
+
+# Profiling configuration; with no sample rate and no token the
+# middleware is not installed at all (see server.py)
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN')
+PROFILE_HEADER = "X-Profile"
+PROFILE_DIR = Path(os.environ.get('PROFILE_DIR', ROOT_DIR / 'profiles'))
+# "cprofile", "pyinstrument" (optional dependency) or "none" for timings only
+PROFILE_CAPTURE = os.environ.get('PROFILE_CAPTURE', 'cprofile').lower()
+
+ENABLED = PROFILE_SAMPLE_RATE > 0 or bool(PROFILE_TOKEN)
+
+try:
+    from pyinstrument import Profiler as PyinstrumentProfiler
+except ImportError:
+    PyinstrumentProfiler = None
+
+_current = ContextVar("request_profile", default=None)
+
+class RequestProfile:
+    """Wall time of one request, broken down into named phases"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+        # MongoDB commands of one request may complete on several executor threads
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds):
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def breakdown(self):
+        """Phase durations in milliseconds
+
+        ``framework`` is what is left of the total: routing, FastAPI
+        parameter and response validation, and middleware.
+        """
+        total = time.perf_counter() - self.started
+        timings = {name: round(seconds * 1000, 3) for name, seconds in self.phases.items()}
+        timings["framework"] = round(max(0.0, total - sum(self.phases.values())) * 1000, 3)
+        timings["total"] = round(total * 1000, 3)
+        return timings
+
+@contextmanager
+def phase(name):
+    """Attribute the enclosed wall time to ``name`` when the request is profiled"""
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(name, time.perf_counter() - started)
+
+class ProfileCommandListener(monitoring.CommandListener):
+    """Attribute MongoDB command time to the profiled request that issued it
+
+    motor copies the context into its executor threads, so the request
+    profile is visible here.
+    """
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        profile = _current.get()
+        if profile is not None:
+            profile.add("mongo", event.duration_micros / 1e6)
+
+    def failed(self, event):
+        self.succeeded(event)
+
+# Listeners passed to the MongoDB client (see database.py)
+MONGO_LISTENERS = [ProfileCommandListener()] if ENABLED else []
+
+def server_timing(timings):
+    return ", ".join(f"{name};dur={duration}" for name, duration in timings.items())
+
+def _file_stem(scope):
+    route = getattr(scope.get("route"), "path", scope["path"])
+    name = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+    return f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{scope['method']}-{name}"
+
+class _Capture:
+    """cProfile or pyinstrument session around one request
+
+    Both profilers are process-wide and also see concurrent requests, so
+    only one capture runs at a time; requests sampled meanwhile still get
+    their phase breakdown.
+    """
+
+    _busy = threading.Lock()
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.profiler = None
+
+    def start(self):
+        if self.kind not in ("cprofile", "pyinstrument") or not self._busy.acquire(blocking=False):
+            return
+        if self.kind == "pyinstrument" and PyinstrumentProfiler is not None:
+            self.profiler = PyinstrumentProfiler(async_mode="enabled")
+        else:
+            self.profiler = cProfile.Profile()
+        if isinstance(self.profiler, cProfile.Profile):
+            self.profiler.enable()
+        else:
+            self.profiler.start()
+
+    def stop(self):
+        if self.profiler is None:
+            return
+        if isinstance(self.profiler, cProfile.Profile):
+            self.profiler.disable()
+        else:
+            self.profiler.stop()
+        self._busy.release()
+
+    def write(self, stem, timings):
+        """Write the profile and its phase breakdown (runs off the event loop)"""
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        (PROFILE_DIR / f"{stem}.json").write_bytes(orjson.dumps(timings, option=orjson.OPT_INDENT_2))
+        if isinstance(self.profiler, cProfile.Profile):
+            self.profiler.dump_stats(PROFILE_DIR / f"{stem}.prof")
+        elif self.profiler is not None:
+            (PROFILE_DIR / f"{stem}.html").write_text(self.profiler.output_html())
+
+class ProfilingMiddleware:
+    """Opt-in per-request profiling
+
+    A request is profiled when it is sampled (PROFILE_SAMPLE_RATE) or
+    sends ``X-Profile: <PROFILE_TOKEN>``. Profiled responses carry a
+    Server-Timing header with the phase breakdown, and the breakdown plus
+    a cProfile (``.prof``, open with snakeviz) or pyinstrument (``.html``)
+    capture are written to PROFILE_DIR.
+    """
+
+    def __init__(self, app, sample_rate=PROFILE_SAMPLE_RATE, token=PROFILE_TOKEN, capture=PROFILE_CAPTURE):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.token = token
+        self.capture = capture
+        if capture == "pyinstrument" and PyinstrumentProfiler is None:
+            logger.warning("pyinstrument is not installed, capturing profiles with cProfile")
+
+    def _wanted(self, scope):
+        if self.token and Headers(scope=scope).get(PROFILE_HEADER) == self.token:
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        capture = _Capture(self.capture)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                headers.append("Server-Timing", server_timing(profile.breakdown()))
+            await send(message)
+
+        reset = _current.set(profile)
+        capture.start()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            capture.stop()
+            _current.reset(reset)
+
+        timings = profile.breakdown()
+        timings["path"] = scope["path"]
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, capture.write, _file_stem(scope), timings)
+        except OSError as e:
+            logger.error(f"Error writing request profile: {str(e)}")
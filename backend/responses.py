@@ -0,0 +1,104 @@
+from fastapi import Request, Response
+from cache import STALE, content_cache
+import access_log
+import asyncio
+import compression
+import profiling
+import http_cache
+import orjson
+
+# Sent instead of the validators when a failed load was answered with an old
+# value: the current revision's ETag would pin the old body in client
+# caches, and shared caches should retry rather than store it
+STALE_HEADERS = {"Cache-Control": "no-store"}
+
+class Payload:
+    """Response data encoded to JSON bytes once, when it is loaded
+
+    Cached payloads are served as-is, so a cache hit costs no
+    serialization and no response-model validation. Only use this for
+    data whose shape is already guaranteed (materialized views read with
+    response-model projections).
+
+    A compressed variant is first built at the cheap per-request level.
+    Once a payload is served a second time, it is worth keeping: a
+    maximum-level variant is then built on a background thread and
+    replaces the cheap one when ready.
+    """
+
+    __slots__ = ("data", "body", "headers", "_variants", "_upgrading")
+
+    def __init__(self, data=None, headers=None, body=None):
+        self.data = data
+        if body is None:
+            with profiling.phase("serialization"):
+                body = orjson.dumps(data)
+        self.body = body
+        self.headers = headers or {}
+        # encoding -> (compressed body, built at the maximum level)
+        self._variants = {}
+        self._upgrading = set()
+
+    def __eq__(self, other):
+        # Same bytes on the wire; lets the cache keep a reloaded payload's variants
+        if not isinstance(other, Payload):
+            return NotImplemented
+        return self.body == other.body and self.headers == other.headers
+
+    def encoded(self, encoding):
+        """Return ``(body compressed with encoding, final)``, compressing cheaply once"""
+        variant = self._variants.get(encoding)
+        if variant is None:
+            with profiling.phase("compression"):
+                variant = self._variants[encoding] = (compression.compress(self.body, encoding), False)
+        elif not variant[1] and encoding not in self._upgrading:
+            self._upgrade(encoding)
+        return variant
+
+    def _upgrade(self, encoding):
+        self._upgrading.add(encoding)
+        future = asyncio.get_running_loop().run_in_executor(
+            compression.static_executor, compression.compress, self.body, encoding, True
+        )
+        future.add_done_callback(lambda done: self._upgraded(encoding, done))
+
+    def _upgraded(self, encoding, future):
+        if not future.cancelled() and future.exception() is None:
+            self._variants[encoding] = (future.result(), True)
+
+    @classmethod
+    def compose(cls, members, headers=None):
+        """Build a JSON object from member payloads without re-encoding them"""
+        encoded = [
+            orjson.dumps(name) + b":" + (value.body if isinstance(value, Payload) else orjson.dumps(value))
+            for name, value in members.items()
+        ]
+        return cls(body=b"{" + b",".join(encoded) + b"}", headers=headers)
+
+def json_response(request: Request, payload: Payload, headers=None):
+    """Send a payload's pre-encoded body, precompressed if the client accepts it"""
+    headers = {**(headers or {}), **payload.headers, "Vary": "Accept-Encoding"}
+    body = payload.body
+
+    encoding = compression.choose_encoding(request.headers.get("accept-encoding", ""))
+    if encoding and len(body) >= compression.MINIMUM_SIZE:
+        body, final = payload.encoded(encoding)
+        headers["Content-Encoding"] = encoding
+        if "ETag" in headers:
+            etag = http_cache.encoded_etag(headers["ETag"], encoding)
+            # The interim variant's bytes change once the final one is ready
+            headers["ETag"] = etag if final else "W/" + etag
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+async def serve_content(request: Request, namespace, key, loader):
+    """Answer a content GET: conditional check, read-through cache, fast response"""
+    headers, not_modified = http_cache.conditional(request, namespace, key)
+    if not_modified is not None:
+        return not_modified
+
+    payload, outcome = await content_cache.lookup(namespace, key, loader)
+    access_log.record_cache(outcome)
+    if outcome == STALE:
+        headers = STALE_HEADERS
+    return json_response(request, payload, headers)
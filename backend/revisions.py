@@ -0,0 +1,53 @@
+from datetime import datetime
+from pymongo import ReturnDocument
+from database import db
+from cache import content_cache
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Content namespaces with a revision counter, shared with the response cache
+CONTENT_NAMESPACES = ("portfolio", "timeline", "projects", "blog")
+
+# namespace -> (revision, updated_at), kept in memory so conditional
+# requests can be answered without a database round-trip
+_revisions = {}
+
+def _remember(document):
+    _revisions[document["_id"]] = (document["rev"], document["updated_at"])
+
+async def load():
+    """Load (or initialize) the revision of every content namespace"""
+    for namespace in CONTENT_NAMESPACES:
+        document = await db.revisions.find_one_and_update(
+            {"_id": namespace},
+            {"$setOnInsert": {"rev": 1, "updated_at": datetime.utcnow()}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        _remember(document)
+    logger.info(f"Loaded content revisions: {_revisions}")
+
+async def bump(namespace):
+    """Record that a namespace changed and drop its cached responses"""
+    content_cache.invalidate(namespace)
+    document = await db.revisions.find_one_and_update(
+        {"_id": namespace},
+        {"$inc": {"rev": 1}, "$set": {"updated_at": datetime.utcnow()}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    _remember(document)
+
+def apply(document):
+    """Adopt a revision written by another worker; return False if not newer"""
+    known = _revisions.get(document["_id"])
+    if known is not None and known[0] >= document["rev"]:
+        return False
+    content_cache.invalidate(document["_id"])
+    _remember(document)
+    return True
+
+def current(namespace):
+    """Return (revision, updated_at) for a namespace, or None if unknown"""
+    return _revisions.get(namespace)
@@ -1,66 +1,95 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from typing import List, Optional
-from models.blog import BlogPost, BlogPostCreate, BlogPostResponse, BlogPostDetail
+from models.blog import BlogPost, BlogPostCreate, BlogPostBulkCreate, BlogPostResponse, BlogPostDetail
 from database import db
+from materializer import materialize, response_fields
+from responses import Payload, serve_content
+from bulk import bulk_upsert
+from pagination import NEXT_CURSOR_HEADER, decode_cursor, keyset_filter, next_cursor
+from cache_control import CachePolicy, cached_route
+import profiling
+import revisions
 import logging
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api", tags=["blog"])
+# New posts should show up within minutes
+CACHE_POLICY = CachePolicy(max_age=60, s_maxage=120, stale_while_revalidate=3600, stale_if_error=86400)
+router = APIRouter(prefix="/api", tags=["blog"], route_class=cached_route(CACHE_POLICY))
+
+# Listing rows skip the post body but keep _id and published_at for the cursor
+LISTING_FIELDS = response_fields(BlogPostResponse, "published_at", include_id=True)
+DETAIL_FIELDS = response_fields(BlogPostDetail)
 
 @router.get("/blog", response_model=List[BlogPostResponse])
 async def get_blog_posts(
+    request: Request,
     lang: Optional[str] = Query("en", regex="^(en|no)$"),
     limit: Optional[int] = Query(10),
-    skip: Optional[int] = Query(0)
+    skip: Optional[int] = Query(0),
+    cursor: Optional[str] = Query(None)
 ):
-    """Get blog posts with language support and pagination"""
+    """Get blog posts with language support and pagination
+
+    Pass the X-Next-Cursor header of a page as ``cursor`` to fetch the next
+    one without skipping; ``skip`` is kept for backward compatibility.
+    """
+    position = decode_cursor(cursor) if cursor else None
     try:
-        posts = await db.blog_posts.find({"published": True})\
-                                  .sort("published_at", -1)\
-                                  .skip(skip)\
-                                  .limit(limit)\
-                                  .to_list(limit)
-        
-        transformed_posts = []
-        for post in posts:
-            transformed_posts.append({
-                "title": post["title"][lang],
-                "excerpt": post["excerpt"][lang],
-                "date": post["published_at"].strftime("%Y-%m-%d") if post.get("published_at") else post["created_at"].strftime("%Y-%m-%d"),
-                "slug": post["slug"][lang],
-                "category": post["category"][lang],
-                "read_time": post["read_time"]
-            })
-        
-        return transformed_posts
+        return await serve_content(
+            request,
+            "blog",
+            ("list", lang, limit, skip, cursor),
+            lambda: load_blog_posts(lang, limit, skip, position)
+        )
         
     except Exception as e:
         logger.error(f"Error fetching blog posts: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+async def load_blog_posts(lang: str, limit: int, skip: int = 0, position=None):
+    """Fetch a page of pre-rendered published posts for the given language
+
+    ``position`` is a decoded cursor; pages are keyset-ordered on
+    (published_at, _id) so deep pages cost the same as the first one.
+    """
+    query = {"lang": lang, "published": True}
+    if position:
+        query.update(keyset_filter("published_at", position))
+        skip = 0
+    
+    posts = await db.blog_post_views.find(query, LISTING_FIELDS)\
+                                    .sort([("published_at", -1), ("_id", -1)])\
+                                    .skip(skip)\
+                                    .limit(limit)\
+                                    .to_list(limit)
+    
+    headers = {}
+    cursor = next_cursor(posts, limit, "published_at")
+    if cursor:
+        headers[NEXT_CURSOR_HEADER] = cursor
+    
+    # Cursor fields are not part of BlogPostResponse
+    with profiling.phase("transform"):
+        for post in posts:
+            del post["_id"]
+            del post["published_at"]
+    
+    return Payload(posts, headers=headers)
+
 @router.get("/blog/{slug}", response_model=BlogPostDetail)
 async def get_blog_post(
+    request: Request,
     slug: str,
     lang: Optional[str] = Query("en", regex="^(en|no)$")
 ):
     """Get a specific blog post by slug"""
     try:
-        # Find post by slug in the specified language
-        post = await db.blog_posts.find_one({
-            f"slug.{lang}": slug,
-            "published": True
-        })
-        
-        if not post:
-            raise HTTPException(status_code=404, detail="Blog post not found")
-        
-        return {
-            "title": post["title"][lang],
-            "content": post["content"][lang],
-            "date": post["published_at"].strftime("%Y-%m-%d") if post.get("published_at") else post["created_at"].strftime("%Y-%m-%d"),
-            "category": post["category"][lang],
-            "read_time": post["read_time"]
-        }
+        return await serve_content(
+            request,
+            "blog",
+            ("detail", lang, slug),
+            lambda: load_blog_post(lang, slug)
+        )
         
     except HTTPException:
         raise
@@ -68,18 +97,63 @@ async def get_blog_post(
         logger.error(f"Error fetching blog post: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+async def load_blog_post(lang: str, slug: str):
+    """Fetch a pre-rendered published post by its localized slug"""
+    post = await db.blog_post_views.find_one({
+        "lang": lang,
+        "slug": slug,
+        "published": True
+    }, DETAIL_FIELDS)
+    
+    if not post:
+        raise HTTPException(status_code=404, detail="Blog post not found")
+    
+    return Payload(post)
+
 @router.post("/blog")
 async def create_blog_post(blog_post: BlogPostCreate):
     """Create a new blog post"""
     try:
-        blog_dict = blog_post.dict()
+        blog_dict = BlogPost(**blog_post.dict()).dict()
         result = await db.blog_posts.insert_one(blog_dict)
         
         if result.inserted_id:
+            await materialize("blog_posts", blog_dict)
+            await revisions.bump("blog")
             return {"message": "Blog post created successfully", "id": str(result.inserted_id)}
         
         raise HTTPException(status_code=400, detail="Failed to create blog post")
         
     except Exception as e:
         logger.error(f"Error creating blog post: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+# Upsert key of the bulk endpoint per ``upsert_by``
+BULK_KEYS = {"id": "id", "slug": "slug.en"}
+
+@router.post("/blog/bulk")
+async def create_blog_posts_bulk(bulk: BlogPostBulkCreate):
+    """Create or update many blog posts at once, matched on ``upsert_by``"""
+    if not bulk.items:
+        raise HTTPException(status_code=400, detail="No blog posts to save")
+    if bulk.upsert_by == "slug" and any("en" not in item.slug for item in bulk.items):
+        raise HTTPException(status_code=400, detail="Every blog post needs an English slug")
+    try:
+        documents = [BlogPost(**item.dict(exclude_none=True)).dict() for item in bulk.items]
+        results, counts = await bulk_upsert(
+            "blog_posts",
+            "blog",
+            documents,
+            BULK_KEYS[bulk.upsert_by],
+            bulk.ordered,
+            preserve=("published_at",)
+        )
+        
+        logger.info(f"Bulk blog post import: {counts}")
+        return {"message": "Bulk blog post import completed", "results": results, "counts": counts}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error saving blog posts: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
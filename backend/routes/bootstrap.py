@@ -0,0 +1,86 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+from typing import Optional
+from models.bootstrap import BootstrapResponse
+from cache import STALE, content_cache
+from responses import STALE_HEADERS, Payload, json_response
+from routes.portfolio import load_portfolio
+from routes.timeline import load_timeline
+from routes.projects import load_projects
+from routes.blog import load_blog_posts
+from pagination import NEXT_CURSOR_HEADER
+from cache_control import CachePolicy, cached_route
+import access_log
+import asyncio
+import http_cache
+import logging
+
+logger = logging.getLogger(__name__)
+# Includes the blog listing, so it follows the blog policy
+CACHE_POLICY = CachePolicy(max_age=60, s_maxage=120, stale_while_revalidate=3600, stale_if_error=86400)
+router = APIRouter(prefix="/api", tags=["bootstrap"], route_class=cached_route(CACHE_POLICY))
+
+# Page size of the blog listing included in the bootstrap payload
+BOOTSTRAP_BLOG_LIMIT = 10
+
+# lang -> (member payloads, composed payload); reusing the composed payload
+# while its members are unchanged keeps its compressed variants, which are
+# far too expensive to rebuild on every request
+_composed = {}
+
+@router.get("/bootstrap", response_model=BootstrapResponse)
+async def get_bootstrap(
+    request: Request,
+    lang: Optional[str] = Query("en", regex="^(en|no)$")
+):
+    """Get all content needed for the initial page load in one response"""
+    headers, not_modified = http_cache.conditional(
+        request,
+        ("portfolio", "timeline", "projects", "blog"),
+        ("bootstrap", lang)
+    )
+    if not_modified is not None:
+        return not_modified
+    
+    try:
+        # Share cache entries with the individual endpoints
+        lookups = await asyncio.gather(
+            content_cache.lookup("portfolio", (lang,), lambda: load_portfolio(lang)),
+            content_cache.lookup("timeline", (lang,), lambda: load_timeline(lang)),
+            content_cache.lookup(
+                "projects",
+                (lang, False),
+                lambda: load_projects(lang, False)
+            ),
+            content_cache.lookup(
+                "blog",
+                ("list", lang, BOOTSTRAP_BLOG_LIMIT, 0, None),
+                lambda: load_blog_posts(lang, BOOTSTRAP_BLOG_LIMIT)
+            )
+        )
+        
+        members = tuple(payload for payload, _ in lookups)
+        portfolio, timeline, projects, blog = members
+        for _, outcome in lookups:
+            access_log.record_cache(outcome)
+        if any(outcome == STALE for _, outcome in lookups):
+            headers = STALE_HEADERS
+        cached = _composed.get(lang)
+        if cached is not None and all(a is b for a, b in zip(cached[0], members)):
+            payload = cached[1]
+        else:
+            # Splice the cached bodies together instead of re-encoding them
+            payload = Payload.compose({
+                "portfolio": portfolio,
+                "timeline": timeline,
+                "projects": projects,
+                "blog": blog,
+                "blog_next_cursor": blog.headers.get(NEXT_CURSOR_HEADER)
+            })
+            _composed[lang] = (members, payload)
+        return json_response(request, payload, headers)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching bootstrap content: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
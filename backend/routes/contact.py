@@ -1,35 +1,62 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
-from models.contact import Contact, ContactCreate, Newsletter, NewsletterCreate
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import List, Optional
+from models.contact import Contact, ContactCreate, Newsletter, NewsletterCreate, NewsletterBulkCreate
 from database import db
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+from contact_queue import contact_queue
+from exports import EXPORT_BATCH_SIZE, export_response
+from materializer import projection
+from pagination import NEXT_CURSOR_HEADER, decode_cursor, keyset_filter, next_cursor
+from cache_control import NO_STORE, cached_route
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api", tags=["contact"])
+# Submissions and admin listings/exports hold personal data
+CACHE_POLICY = NO_STORE
+router = APIRouter(prefix="/api", tags=["contact"], route_class=cached_route(CACHE_POLICY))
+
+# Columns of the admin exports
+CONTACT_FIELDS = list(Contact.model_fields)
+NEWSLETTER_FIELDS = list(Newsletter.model_fields)
 
 @router.post("/contact")
 async def submit_contact_form(contact: ContactCreate):
-    """Submit contact form"""
+    """Submit contact form (stored asynchronously by the contact queue)"""
     try:
-        contact_dict = contact.dict()
-        result = await db.contacts.insert_one(contact_dict)
-        
-        if result.inserted_id:
-            # Here you could add email notification logic
-            logger.info(f"New contact form submission from {contact.email}")
-            return {"message": "Thank you for your message. I'll get back to you soon!"}
-        
-        raise HTTPException(status_code=400, detail="Failed to submit contact form")
+        await contact_queue.submit(Contact(**contact.dict()).dict())
+        return {"message": "Thank you for your message. I'll get back to you soon!"}
         
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=429, detail="Too many submissions, please try again later")
     except Exception as e:
         logger.error(f"Error submitting contact form: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/contacts")
-async def get_contacts():
-    """Get all contact form submissions (admin endpoint)"""
+async def get_contacts(
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None)
+):
+    """Get contact form submissions, newest first (admin endpoint)
+
+    Pass the X-Next-Cursor header of a page as ``cursor`` for the next one.
+    """
     try:
-        contacts = await db.contacts.find().sort("submitted_at", -1).to_list(100)
+        query = {}
+        if cursor:
+            query.update(keyset_filter("submitted_at", decode_cursor(cursor), nullable=True))
+        
+        contacts = await db.contacts.find(query)\
+                                    .sort([("submitted_at", -1), ("_id", -1)])\
+                                    .limit(limit)\
+                                    .to_list(limit)
+        
+        following = next_cursor(contacts, limit, "submitted_at")
+        if following:
+            response.headers[NEXT_CURSOR_HEADER] = following
         
         # Convert ObjectIds to strings
         for contact in contacts:
@@ -37,46 +64,134 @@ async def get_contacts():
         
         return contacts
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching contacts: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@router.get("/contacts/export")
+async def export_contacts(
+    export_format: str = Query("ndjson", alias="format", regex="^(ndjson|csv)$"),
+    batch_size: int = Query(EXPORT_BATCH_SIZE, ge=1, le=10000)
+):
+    """Stream all contact form submissions as NDJSON or CSV (admin endpoint)"""
+    cursor = db.contacts.find({}, projection(*CONTACT_FIELDS))\
+                        .sort([("submitted_at", -1), ("_id", -1)])
+    return export_response(cursor, export_format, CONTACT_FIELDS, "contacts", batch_size)
+
+# Outcome of a subscription -> response message
+SUBSCRIPTION_MESSAGES = {
+    "subscribed": "Successfully subscribed to newsletter",
+    "resubscribed": "Successfully resubscribed to newsletter",
+    "already_subscribed": "Email already subscribed to newsletter",
+}
+
+def _subscription_update(email):
+    """Upsert update that (re)subscribes an email, filling defaults on insert"""
+    defaults = Newsletter(email=email).dict()
+    return {
+        "$set": {"subscribed": True, "unsubscribed_at": None},
+        "$setOnInsert": {"id": defaults["id"], "subscribed_at": defaults["subscribed_at"]}
+    }
+
+def _subscription_status(previous):
+    """Classify a subscription from the document as it was before the upsert"""
+    if previous is None:
+        return "subscribed"
+    if previous.get("subscribed", False):
+        return "already_subscribed"
+    return "resubscribed"
+
 @router.post("/newsletter")
 async def subscribe_newsletter(newsletter: NewsletterCreate):
-    """Subscribe to newsletter"""
+    """Subscribe to newsletter in a single atomic upsert"""
     try:
-        # Check if email already exists
-        existing = await db.newsletter.find_one({"email": newsletter.email})
-        if existing:
-            if existing.get("subscribed", False):
-                return {"message": "Email already subscribed to newsletter"}
-            else:
-                # Resubscribe
-                await db.newsletter.update_one(
-                    {"email": newsletter.email},
-                    {"$set": {"subscribed": True, "unsubscribed_at": None}}
-                )
-                return {"message": "Successfully resubscribed to newsletter"}
-        
-        # New subscription
-        newsletter_dict = newsletter.dict()
-        result = await db.newsletter.insert_one(newsletter_dict)
-        
-        if result.inserted_id:
-            logger.info(f"New newsletter subscription: {newsletter.email}")
-            return {"message": "Successfully subscribed to newsletter"}
+        try:
+            previous = await db.newsletter.find_one_and_update(
+                {"email": newsletter.email},
+                _subscription_update(newsletter.email),
+                projection={"subscribed": 1},
+                upsert=True,
+                return_document=ReturnDocument.BEFORE
+            )
+        except DuplicateKeyError:
+            # Lost an insert race on the unique email index; the retry matches
+            previous = await db.newsletter.find_one_and_update(
+                {"email": newsletter.email},
+                _subscription_update(newsletter.email),
+                projection={"subscribed": 1},
+                return_document=ReturnDocument.BEFORE
+            )
         
-        raise HTTPException(status_code=400, detail="Failed to subscribe to newsletter")
+        status = _subscription_status(previous)
+        if status == "subscribed":
+            logger.info(f"New newsletter subscription: {newsletter.email}")
+        return {"message": SUBSCRIPTION_MESSAGES[status], "status": status}
         
     except Exception as e:
         logger.error(f"Error subscribing to newsletter: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@router.post("/newsletter/bulk")
+async def subscribe_newsletter_bulk(newsletter_bulk: NewsletterBulkCreate):
+    """Subscribe many emails at once (admin import endpoint)"""
+    try:
+        emails = list(dict.fromkeys(newsletter_bulk.emails))
+        if not emails:
+            raise HTTPException(status_code=400, detail="No emails to subscribe")
+        
+        existing = await db.newsletter.find(
+            {"email": {"$in": emails}},
+            {"_id": 0, "email": 1, "subscribed": 1}
+        ).to_list(None)
+        previous = {document["email"]: document for document in existing}
+        
+        await db.newsletter.bulk_write(
+            [
+                UpdateOne({"email": email}, _subscription_update(email), upsert=True)
+                for email in emails
+            ],
+            ordered=False
+        )
+        
+        results = {email: _subscription_status(previous.get(email)) for email in emails}
+        counts = {status: 0 for status in SUBSCRIPTION_MESSAGES}
+        for status in results.values():
+            counts[status] += 1
+        
+        logger.info(f"Bulk newsletter import: {counts}")
+        return {"message": "Bulk subscription completed", "results": results, "counts": counts}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error bulk subscribing to newsletter: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @router.get("/newsletter")
-async def get_newsletter_subscribers():
-    """Get all newsletter subscribers (admin endpoint)"""
+async def get_newsletter_subscribers(
+    response: Response,
+    limit: int = Query(1000, ge=1, le=1000),
+    cursor: Optional[str] = Query(None)
+):
+    """Get active newsletter subscribers, newest first (admin endpoint)
+
+    Pass the X-Next-Cursor header of a page as ``cursor`` for the next one.
+    """
     try:
-        subscribers = await db.newsletter.find({"subscribed": True}).to_list(1000)
+        query = {"subscribed": True}
+        if cursor:
+            query.update(keyset_filter("subscribed_at", decode_cursor(cursor), nullable=True))
+        
+        subscribers = await db.newsletter.find(query)\
+                                         .sort([("subscribed_at", -1), ("_id", -1)])\
+                                         .limit(limit)\
+                                         .to_list(limit)
+        
+        following = next_cursor(subscribers, limit, "subscribed_at")
+        if following:
+            response.headers[NEXT_CURSOR_HEADER] = following
         
         # Convert ObjectIds to strings
         for subscriber in subscribers:
@@ -84,6 +199,18 @@ async def get_newsletter_subscribers():
         
         return subscribers
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching newsletter subscribers: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/newsletter/export")
+async def export_newsletter_subscribers(
+    export_format: str = Query("ndjson", alias="format", regex="^(ndjson|csv)$"),
+    batch_size: int = Query(EXPORT_BATCH_SIZE, ge=1, le=10000)
+):
+    """Stream active newsletter subscribers as NDJSON or CSV (admin endpoint)"""
+    cursor = db.newsletter.find({"subscribed": True}, projection(*NEWSLETTER_FIELDS))\
+                          .sort([("subscribed_at", -1), ("_id", -1)])
+    return export_response(cursor, export_format, NEWSLETTER_FIELDS, "newsletter", batch_size)
\ No newline at end of file
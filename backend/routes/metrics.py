@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from cache_control import NO_STORE, cached_route
+
+CACHE_POLICY = NO_STORE
+router = APIRouter(prefix="/api", tags=["metrics"], route_class=cached_route(CACHE_POLICY))
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus metrics in the text exposition format"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -1,57 +1,44 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from typing import Optional
 from models.portfolio import Portfolio, PortfolioCreate
 from database import db
+from materializer import materialize, projection
+from responses import Payload, serve_content
+from cache_control import CachePolicy, cached_route
+import revisions
 import logging
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api", tags=["portfolio"])
+# Changes rarely: browsers revalidate after a minute, CDNs keep it for
+# five and may serve it stale for a day while revalidating
+CACHE_POLICY = CachePolicy(max_age=60, s_maxage=300, stale_while_revalidate=86400, stale_if_error=604800)
+router = APIRouter(prefix="/api", tags=["portfolio"], route_class=cached_route(CACHE_POLICY))
+
+PORTFOLIO_FIELDS = projection("personal", "home", "about")
 
 @router.get("/portfolio")
-async def get_portfolio(lang: Optional[str] = Query("en", regex="^(en|no)$")):
+async def get_portfolio(
+    request: Request,
+    lang: Optional[str] = Query("en", regex="^(en|no)$")
+):
     """Get portfolio content with language support"""
     try:
-        portfolio = await db.portfolio.find_one()
-        if not portfolio:
-            raise HTTPException(status_code=404, detail="Portfolio not found")
-        
-        # Convert ObjectId to string
-        portfolio["_id"] = str(portfolio["_id"])
-        
-        # Transform the data based on language
-        transformed = {
-            "personal": {
-                "name": portfolio["personal_info"]["name"],
-                "title": portfolio["personal_info"]["title"][lang],
-                "email": portfolio["personal_info"]["email"],
-                "linkedin": portfolio["personal_info"]["linkedin"],
-                "github": portfolio["personal_info"]["github"],
-                "profileImage": portfolio["personal_info"]["profile_image"],
-                "birthdate": portfolio["personal_info"]["birthdate"]
-            },
-            "home": portfolio["home"][lang],
-            "about": {
-                "education": [
-                    {
-                        "degree": item["degree"],
-                        "institution": item["institution"],
-                        "period": item["period"],
-                        "thesis": item.get("thesis")
-                    }
-                    for item in portfolio["about"]["education"][lang]
-                ],
-                "skills": portfolio["about"]["skills"][lang],
-                "languages": portfolio["about"]["languages"][lang],
-                "interests": portfolio["about"]["interests"][lang]
-            }
-        }
-        
-        return transformed
+        return await serve_content(request, "portfolio", (lang,), lambda: load_portfolio(lang))
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching portfolio: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+async def load_portfolio(lang: str):
+    """Fetch the pre-rendered portfolio view for the given language"""
+    portfolio = await db.portfolio_views.find_one({"lang": lang}, PORTFOLIO_FIELDS)
+    if not portfolio:
+        raise HTTPException(status_code=404, detail="Portfolio not found")
+    
+    return Payload(portfolio)
+
 @router.post("/portfolio")
 async def create_portfolio(portfolio: PortfolioCreate):
     """Create or update portfolio content"""
@@ -59,7 +46,7 @@ async def create_portfolio(portfolio: PortfolioCreate):
         portfolio_dict = portfolio.dict()
         
         # Check if portfolio already exists
-        existing = await db.portfolio.find_one()
+        existing = await db.portfolio.find_one({}, {"_id": 1})
         if existing:
             # Update existing portfolio
             result = await db.portfolio.update_one(
@@ -67,11 +54,15 @@ async def create_portfolio(portfolio: PortfolioCreate):
                 {"$set": portfolio_dict}
             )
             if result.modified_count:
+                await materialize("portfolio", {**portfolio_dict, "_id": existing["_id"]})
+                await revisions.bump("portfolio")
                 return {"message": "Portfolio updated successfully"}
         else:
             # Create new portfolio
             result = await db.portfolio.insert_one(portfolio_dict)
             if result.inserted_id:
+                await materialize("portfolio", portfolio_dict)
+                await revisions.bump("portfolio")
                 return {"message": "Portfolio created successfully"}
         
         raise HTTPException(status_code=400, detail="Failed to save portfolio")
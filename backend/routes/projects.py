@@ -1,41 +1,49 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from typing import List, Optional
-from models.project import Project, ProjectCreate, ProjectResponse
+from models.project import Project, ProjectCreate, ProjectBulkCreate, ProjectResponse
 from database import db
+from materializer import materialize, response_fields
+from responses import Payload, serve_content
+from bulk import bulk_upsert
+from cache_control import CachePolicy, cached_route
+import revisions
 import logging
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api", tags=["projects"])
+# Changes rarely, same policy as the portfolio
+CACHE_POLICY = CachePolicy(max_age=60, s_maxage=300, stale_while_revalidate=86400, stale_if_error=604800)
+router = APIRouter(prefix="/api", tags=["projects"], route_class=cached_route(CACHE_POLICY))
+
+PROJECT_FIELDS = response_fields(ProjectResponse)
 
 @router.get("/projects", response_model=List[ProjectResponse])
 async def get_projects(
+    request: Request,
     lang: Optional[str] = Query("en", regex="^(en|no)$"),
     featured_only: Optional[bool] = Query(False)
 ):
     """Get projects with language support"""
     try:
-        query = {}
-        if featured_only:
-            query["featured"] = True
-            
-        projects = await db.projects.find(query).sort("order", 1).to_list(100)
-        
-        transformed_projects = []
-        for project in projects:
-            transformed_projects.append({
-                "title": project["title"][lang],
-                "description": project["description"][lang],
-                "technologies": project["technologies"],
-                "github": project["github"],
-                "live_url": project.get("live_url")
-            })
-        
-        return transformed_projects
+        return await serve_content(
+            request,
+            "projects",
+            (lang, featured_only),
+            lambda: load_projects(lang, featured_only)
+        )
         
     except Exception as e:
         logger.error(f"Error fetching projects: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+async def load_projects(lang: str, featured_only: bool):
+    """Fetch the pre-rendered project views for the given language"""
+    query = {"lang": lang}
+    if featured_only:
+        query["featured"] = True
+        
+    projects = await db.project_views.find(query, PROJECT_FIELDS).sort("order", 1).to_list(100)
+    return Payload(projects)
+
 @router.post("/projects")
 async def create_project(project: ProjectCreate):
     """Create a new project"""
@@ -44,10 +52,30 @@ async def create_project(project: ProjectCreate):
         result = await db.projects.insert_one(project_dict)
         
         if result.inserted_id:
+            await materialize("projects", project_dict)
+            await revisions.bump("projects")
             return {"message": "Project created successfully", "id": str(result.inserted_id)}
         
         raise HTTPException(status_code=400, detail="Failed to create project")
         
     except Exception as e:
         logger.error(f"Error creating project: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.post("/projects/bulk")
+async def create_projects_bulk(bulk: ProjectBulkCreate):
+    """Create or update many projects at once, matched on ``id``"""
+    if not bulk.items:
+        raise HTTPException(status_code=400, detail="No projects to save")
+    try:
+        documents = [Project(**item.dict(exclude_none=True)).dict() for item in bulk.items]
+        results, counts = await bulk_upsert("projects", "projects", documents, "id", bulk.ordered)
+        
+        logger.info(f"Bulk project import: {counts}")
+        return {"message": "Bulk project import completed", "results": results, "counts": counts}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error saving projects: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
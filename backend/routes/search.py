@@ -0,0 +1,29 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+from typing import List, Optional
+from models.search import SearchResult
+from responses import Payload, json_response
+from search_index import search_index
+from cache_control import CachePolicy, cached_route
+import logging
+
+logger = logging.getLogger(__name__)
+# Many distinct URLs; short-lived so new posts become searchable quickly
+CACHE_POLICY = CachePolicy(max_age=30, s_maxage=60, stale_while_revalidate=300)
+router = APIRouter(prefix="/api", tags=["search"], route_class=cached_route(CACHE_POLICY))
+
+@router.get("/search", response_model=List[SearchResult])
+async def search(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    lang: Optional[str] = Query("en", regex="^(en|no)$"),
+    type: Optional[str] = Query(None, regex="^(blog|project)$"),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """Full-text search over published blog posts and projects"""
+    try:
+        results = search_index.search(q, lang, limit=limit, kind=type)
+        return json_response(request, Payload(results))
+        
+    except Exception as e:
+        logger.error(f"Error searching content: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
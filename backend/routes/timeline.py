@@ -1,33 +1,41 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from typing import List, Optional
-from models.timeline import Timeline, TimelineCreate, TimelineResponse
+from models.timeline import Timeline, TimelineCreate, TimelineBulkCreate, TimelineResponse
 from database import db
+from materializer import materialize, response_fields
+from responses import Payload, serve_content
+from bulk import bulk_upsert
+from cache_control import CachePolicy, cached_route
+import revisions
 import logging
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api", tags=["timeline"])
+# Changes rarely, same policy as the portfolio
+CACHE_POLICY = CachePolicy(max_age=60, s_maxage=300, stale_while_revalidate=86400, stale_if_error=604800)
+router = APIRouter(prefix="/api", tags=["timeline"], route_class=cached_route(CACHE_POLICY))
+
+TIMELINE_FIELDS = response_fields(TimelineResponse)
 
 @router.get("/timeline", response_model=List[TimelineResponse])
-async def get_timeline(lang: Optional[str] = Query("en", regex="^(en|no)$")):
+async def get_timeline(
+    request: Request,
+    lang: Optional[str] = Query("en", regex="^(en|no)$")
+):
     """Get work experience timeline with language support"""
     try:
-        timeline_items = await db.timeline.find().sort("order", -1).to_list(100)
-        
-        transformed_items = []
-        for item in timeline_items:
-            transformed_items.append({
-                "year": item["year"],
-                "title": item["title"][lang],
-                "company": item["company"][lang],
-                "description": item["description"][lang]
-            })
-        
-        return transformed_items
+        return await serve_content(request, "timeline", (lang,), lambda: load_timeline(lang))
         
     except Exception as e:
         logger.error(f"Error fetching timeline: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+async def load_timeline(lang: str):
+    """Fetch the pre-rendered timeline views for the given language"""
+    items = await db.timeline_views.find({"lang": lang}, TIMELINE_FIELDS)\
+                                   .sort("order", -1)\
+                                   .to_list(100)
+    return Payload(items)
+
 @router.post("/timeline")
 async def create_timeline_item(timeline_item: TimelineCreate):
     """Create a new timeline item"""
@@ -36,10 +44,30 @@ async def create_timeline_item(timeline_item: TimelineCreate):
         result = await db.timeline.insert_one(timeline_dict)
         
         if result.inserted_id:
+            await materialize("timeline", timeline_dict)
+            await revisions.bump("timeline")
             return {"message": "Timeline item created successfully", "id": str(result.inserted_id)}
         
         raise HTTPException(status_code=400, detail="Failed to create timeline item")
         
     except Exception as e:
         logger.error(f"Error creating timeline item: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.post("/timeline/bulk")
+async def create_timeline_items_bulk(bulk: TimelineBulkCreate):
+    """Create or update many timeline items at once, matched on ``id``"""
+    if not bulk.items:
+        raise HTTPException(status_code=400, detail="No timeline items to save")
+    try:
+        documents = [Timeline(**item.dict(exclude_none=True)).dict() for item in bulk.items]
+        results, counts = await bulk_upsert("timeline", "timeline", documents, "id", bulk.ordered)
+        
+        logger.info(f"Bulk timeline item import: {counts}")
+        return {"message": "Bulk timeline item import completed", "results": results, "counts": counts}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error saving timeline items: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
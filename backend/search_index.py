@@ -0,0 +1,244 @@
+from collections import defaultdict
+from database import db
+import heapq
+import html
+import logging
+import math
+import re
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+STOPWORDS = {
+    "en": {
+        "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "into",
+        "is", "it", "of", "on", "or", "that", "the", "this", "to", "with"
+    },
+    "no": {
+        "og", "i", "jeg", "det", "at", "en", "et", "den", "til", "er", "som", "på",
+        "de", "med", "han", "av", "ikke", "der", "så", "var", "meg", "seg", "men",
+        "om", "for", "har", "fra", "du", "vi", "kan", "eller", "hva", "hvordan"
+    },
+}
+
+# Light suffix stripping, longest suffix first
+SUFFIXES = {
+    "en": ("ations", "ation", "ings", "ing", "ies", "ed", "es", "ly", "s"),
+    "no": ("ene", "ane", "ende", "het", "ens", "ers", "er", "en", "et", "e"),
+}
+
+MIN_STEM_LENGTH = 3
+
+# Field weights: matches in titles count more than matches in bodies
+BLOG_FIELDS = {"title": 3.0, "category": 2.0, "excerpt": 2.0, "content": 1.0}
+PROJECT_FIELDS = {"title": 3.0, "technologies": 2.0, "description": 1.0}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+SNIPPET_RADIUS = 80
+
+def stem(token, lang):
+    for suffix in SUFFIXES[lang]:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM_LENGTH:
+            return token[:-len(suffix)]
+    return token
+
+def terms(text, lang):
+    """Normalize, tokenize, drop stopwords and stem text for one language"""
+    text = unicodedata.normalize("NFKC", text).lower()
+    return [
+        stem(token, lang)
+        for token in TOKEN_PATTERN.findall(text)
+        if token not in STOPWORDS[lang]
+    ]
+
+def _term(token, lang):
+    return stem(unicodedata.normalize("NFKC", token).lower(), lang)
+
+def first_offsets(text, lang):
+    """Map each term of ``text`` to the offset of its first occurrence"""
+    offsets = {}
+    for match in TOKEN_PATTERN.finditer(text):
+        offsets.setdefault(_term(match.group(), lang), match.start())
+    return offsets
+
+def snippet(text, offsets, query_terms, lang):
+    """Excerpt of ``text`` around the first query match with matches in <mark>
+
+    ``offsets`` comes from ``first_offsets`` at index time, so only the
+    excerpt itself is tokenized per query.
+    """
+    starts = [offsets[term] for term in query_terms if term in offsets]
+    if not starts:
+        excerpt = text[:2 * SNIPPET_RADIUS]
+        return html.escape(excerpt) + ("…" if len(text) > len(excerpt) else "")
+
+    first = TOKEN_PATTERN.match(text, min(starts))
+    start = max(0, first.start() - SNIPPET_RADIUS)
+    end = min(len(text), first.end() + SNIPPET_RADIUS)
+    pieces = ["…" if start > 0 else ""]
+    position = start
+    for match in TOKEN_PATTERN.finditer(text, start, end):
+        # Skip words cut by the excerpt bounds
+        if match.start() == start and start > 0 and TOKEN_PATTERN.match(text[start - 1]):
+            continue
+        if match.end() == end and end < len(text) and TOKEN_PATTERN.match(text[end]):
+            continue
+        if _term(match.group(), lang) not in query_terms:
+            continue
+        pieces.append(html.escape(text[position:match.start()]))
+        pieces.append(f"<mark>{html.escape(match.group())}</mark>")
+        position = match.end()
+    pieces.append(html.escape(text[position:end]))
+    pieces.append("…" if end < len(text) else "")
+    return "".join(pieces)
+
+class SearchIndex:
+    """In-process BM25 inverted index over published blog posts and projects
+
+    Built from the materialized views at startup and updated by the
+    materializer whenever a post or project is (re)rendered.
+    """
+
+    def __init__(self):
+        # lang -> term -> {key: (weighted term frequency, document length)}
+        self._postings = {lang: defaultdict(dict) for lang in STOPWORDS}
+        # key -> indexed document
+        self._documents = {}
+        self._total_length = {lang: 0.0 for lang in STOPWORDS}
+        self._counts = {lang: 0 for lang in STOPWORDS}
+
+    def __len__(self):
+        return len(self._documents)
+
+    def remove(self, key):
+        document = self._documents.pop(key, None)
+        if document is None:
+            return
+        postings = self._postings[document["lang"]]
+        for term in document["terms"]:
+            entries = postings.get(term)
+            if entries is not None:
+                entries.pop(key, None)
+                if not entries:
+                    del postings[term]
+        self._total_length[document["lang"]] -= document["length"]
+        self._counts[document["lang"]] -= 1
+
+    def add(self, key, lang, kind, fields, result, body):
+        """Index one document from (text, weight) field pairs"""
+        self.remove(key)
+
+        frequencies = defaultdict(float)
+        length = 0.0
+        for text, weight in fields:
+            for term in terms(text, lang):
+                frequencies[term] += weight
+                length += weight
+
+        postings = self._postings[lang]
+        for term, frequency in frequencies.items():
+            postings[term][key] = (frequency, length)
+
+        self._documents[key] = {
+            "lang": lang,
+            "kind": kind,
+            "terms": list(frequencies),
+            "length": length,
+            "result": result,
+            "body": body,
+            "offsets": first_offsets(body, lang),
+        }
+        self._total_length[lang] += length
+        self._counts[lang] += 1
+
+    def index_view(self, collection, view):
+        """Index (or drop) a rendered blog post or project view"""
+        key = (collection, view["source_id"], view["lang"])
+        if collection == "blog_posts":
+            if not view.get("published"):
+                self.remove(key)
+                return
+            fields = [(view[name] or "", weight) for name, weight in BLOG_FIELDS.items()]
+            result = {
+                "type": "blog",
+                "title": view["title"],
+                "slug": view["slug"],
+                "date": view["date"],
+                "category": view["category"],
+            }
+            self.add(key, view["lang"], "blog", fields, result, view["content"] or view["excerpt"])
+        elif collection == "projects":
+            fields = [
+                (view["title"], PROJECT_FIELDS["title"]),
+                (" ".join(view["technologies"]), PROJECT_FIELDS["technologies"]),
+                (view["description"], PROJECT_FIELDS["description"]),
+            ]
+            result = {
+                "type": "project",
+                "title": view["title"],
+                "github": view["github"],
+                "live_url": view.get("live_url"),
+            }
+            self.add(key, view["lang"], "project", fields, result, view["description"])
+
+    def search(self, query, lang, limit=10, kind=None):
+        """Return ranked results with highlighted snippets"""
+        query_terms = set(terms(query, lang))
+        documents_in_lang = self._counts[lang]
+        if not query_terms or not documents_in_lang:
+            return []
+
+        # BM25 length normalization: K1 * (1 - B + B * length / average_length)
+        base = K1 * (1 - B)
+        slope = K1 * B * documents_in_lang / self._total_length[lang]
+        postings = self._postings[lang]
+        scores = defaultdict(float)
+        for term in query_terms:
+            entries = postings.get(term)
+            if not entries:
+                continue
+            idf = math.log(1 + (documents_in_lang - len(entries) + 0.5) / (len(entries) + 0.5))
+            boost = idf * (K1 + 1)
+            for key, (frequency, length) in entries.items():
+                scores[key] += boost * frequency / (frequency + base + slope * length)
+
+        ranked = heapq.nlargest(
+            limit,
+            (key for key in scores if kind is None or self._documents[key]["kind"] == kind),
+            key=scores.get
+        )
+
+        return [
+            {
+                **self._documents[key]["result"],
+                "snippet": snippet(
+                    self._documents[key]["body"],
+                    self._documents[key]["offsets"],
+                    query_terms,
+                    lang
+                ),
+                "score": round(scores[key], 4),
+            }
+            for key in ranked
+        ]
+
+    async def rebuild(self):
+        """Rebuild the index from the materialized views, then swap it in"""
+        fresh = SearchIndex()
+        async for view in db.blog_post_views.find({"published": True}, {"_id": 0}):
+            fresh.index_view("blog_posts", view)
+        async for view in db.project_views.find({}, {"_id": 0}):
+            fresh.index_view("projects", view)
+
+        self._postings = fresh._postings
+        self._documents = fresh._documents
+        self._total_length = fresh._total_length
+        self._counts = fresh._counts
+        logger.info(f"Search index built with {len(self)} document(s)")
+
+search_index = SearchIndex()
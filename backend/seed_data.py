@@ -1,5 +1,13 @@
 import asyncio
 from database import db
+from models.blog import BlogPostBulkCreate
+from models.project import ProjectBulkCreate
+from models.timeline import TimelineBulkCreate
+from routes.blog import create_blog_posts_bulk
+from routes.projects import create_projects_bulk
+from routes.timeline import create_timeline_items_bulk
+from materializer import rebuild_all
+import revisions
 from datetime import datetime
 
 # Mock data from frontend (converted to backend format)
@@ -290,15 +298,23 @@ async def seed_database():
         await db.portfolio.insert_one(portfolio_data)
         print("✅ Portfolio data inserted")
         
-        await db.timeline.insert_many(timeline_data)
+        # Same validation and write path as the bulk import endpoints
+        await create_timeline_items_bulk(TimelineBulkCreate(items=timeline_data))
         print("✅ Timeline data inserted")
         
-        await db.projects.insert_many(projects_data)
+        await create_projects_bulk(ProjectBulkCreate(items=projects_data))
         print("✅ Projects data inserted")
         
-        await db.blog_posts.insert_many(blog_posts_data)
+        await create_blog_posts_bulk(BlogPostBulkCreate(items=blog_posts_data))
         print("✅ Blog posts data inserted")
         
+        await rebuild_all()
+        print("✅ Materialized views rebuilt")
+        
+        for namespace in revisions.CONTENT_NAMESPACES:
+            await revisions.bump(namespace)
+        print("✅ Content revisions bumped")
+        
         print("🎉 Database seeded successfully!")
         
     except Exception as e:
@@ -1,24 +1,61 @@
 from fastapi import FastAPI, APIRouter
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from contextlib import asynccontextmanager
 import os
 import logging
 from pathlib import Path
 
 # Import route modules
-from routes import portfolio, timeline, projects, blog, contact
+from routes import portfolio, timeline, projects, blog, contact, bootstrap, search, metrics as metrics_routes
+import indexes
+import materializer
+import revisions
+from database import connection
+from contact_queue import contact_queue
+from search_index import search_index
+from invalidation import invalidation_watcher
+from compression import CompressionMiddleware
+from metrics import MetricsMiddleware
+import profiling
+import access_log
+from pagination import NEXT_CURSOR_HEADER
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+# Configure logging (queue-based, see access_log.py)
+access_log.configure_logging(logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Startup steps, each failing soft so the API still serves what it can
+STARTUP_STEPS = [
+    ("connecting to MongoDB", connection.open),
+    ("creating indexes", indexes.ensure_indexes),
+    ("materializing views", materializer.rebuild_all),
+    ("building the search index", search_index.rebuild),
+    ("loading content revisions", revisions.load),
+    ("starting the contact queue", contact_queue.start),
+    ("watching for content changes", invalidation_watcher.start),
+]
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    for description, step in STARTUP_STEPS:
+        try:
+            await step()
+        except Exception as e:
+            logger.error(f"Error {description}: {str(e)}")
+    
+    yield
+    
+    await invalidation_watcher.stop()
+    await contact_queue.stop()
+    connection.close()
+    access_log.stop_logging()
 
 # Create the main app without a prefix
-app = FastAPI(title="Andreas Stenberg Portfolio API", version="1.0.0")
+app = FastAPI(title="Andreas Stenberg Portfolio API", version="1.0.0", lifespan=lifespan)
 
 # Include all routers
 app.include_router(portfolio.router)
@@ -26,6 +63,9 @@ app.include_router(timeline.router)
 app.include_router(projects.router)
 app.include_router(blog.router)
 app.include_router(contact.router)
+app.include_router(bootstrap.router)
+app.include_router(search.router)
+app.include_router(metrics_routes.router)
 
 # Health check endpoint
 @app.get("/api/health")
@@ -37,21 +77,23 @@ async def health_check():
 async def root():
     return {"message": "Hello World"}
 
+app.add_middleware(CompressionMiddleware)
+
+# Opt-in (PROFILE_SAMPLE_RATE / PROFILE_TOKEN); no overhead when disabled
+if profiling.ENABLED:
+    app.add_middleware(profiling.ProfilingMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
+# Added last so they are outermost and their latency covers the other middleware
+app.add_middleware(MetricsMiddleware)
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
+if access_log.ACCESS_LOG_ENABLED:
+    app.add_middleware(access_log.AccessLogMiddleware)
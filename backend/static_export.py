@@ -0,0 +1,242 @@
+"""Pre-render all public content to static, content-hashed JSON files
+
+Reads every content namespace through the route loaders (the same
+payloads the API serves) and writes them per language::
+
+    en/portfolio.<hash>.json            en/blog/page-1.<hash>.json
+    en/timeline.<hash>.json             en/blog/posts/<slug>.<hash>.json
+    en/projects.<hash>.json             en/blog/<slug>/index.html (--html)
+    en/projects-featured.<hash>.json    manifest.json
+
+``manifest.json`` maps logical names (e.g. ``en/blog/page-2``) to the
+hashed files and is the only file that must not be cached for long.
+
+Rebuilds are incremental: a namespace whose content revision matches the
+previous manifest is carried over without reading it, files whose hash
+already exists are not rewritten, and files no longer referenced are
+removed after the new manifest is in place, so the output directory
+should be used for the export only::
+
+    python static_export.py --out ../frontend/public/content [--html] [--full]
+"""
+from datetime import datetime
+from fastapi import HTTPException
+from pathlib import Path
+from routes.portfolio import load_portfolio
+from routes.timeline import load_timeline
+from routes.projects import load_projects
+from routes.blog import load_blog_post, load_blog_posts
+from materializer import LANGUAGES
+from pagination import NEXT_CURSOR_HEADER, decode_cursor
+import argparse
+import asyncio
+import hashlib
+import html
+import orjson
+import os
+import re
+import revisions
+
+ROOT_DIR = Path(__file__).parent
+
+STATIC_EXPORT_DIR = Path(os.environ.get('STATIC_EXPORT_DIR', ROOT_DIR / 'static_export'))
+STATIC_BLOG_PAGE_SIZE = int(os.environ.get('STATIC_BLOG_PAGE_SIZE', '10'))
+
+MANIFEST = "manifest.json"
+# Slugs become path segments, so anything else is skipped
+SAFE_SLUG = re.compile(r"^[\w-]+$")
+HASH_LENGTH = 12
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="{lang}">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+</head>
+<body>
+<article>
+<h1>{title}</h1>
+<p><time datetime="{date}">{date}</time> · {category} · {read_time}</p>
+{content}
+</article>
+</body>
+</html>
+"""
+
+def content_hash(body):
+    return hashlib.sha256(body).hexdigest()[:HASH_LENGTH]
+
+def render_html(lang, post):
+    paragraphs = "\n".join(
+        f"<p>{html.escape(paragraph)}</p>"
+        for paragraph in post["content"].split("\n\n") if paragraph.strip()
+    )
+    return HTML_TEMPLATE.format(
+        lang=lang,
+        title=html.escape(post["title"]),
+        date=html.escape(post["date"]),
+        category=html.escape(post["category"]),
+        read_time=html.escape(post["read_time"]),
+        content=paragraphs
+    ).encode()
+
+class StaticExport:
+    """One export run into ``out``, reusing what the previous run wrote"""
+
+    def __init__(self, out, html_pages=False, full=False):
+        self.out = Path(out)
+        self.html_pages = html_pages
+        self.previous = {} if full else self._read_manifest()
+        # namespace -> logical name -> relative file path
+        self.files = {}
+        self.pages = {}
+        self.written = 0
+        self.unchanged = 0
+
+    def _read_manifest(self):
+        try:
+            return orjson.loads((self.out / MANIFEST).read_bytes())
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            return {}
+
+    def _write_file(self, relative, body):
+        path = self.out / relative
+        if path.exists() and path.read_bytes() == body:
+            self.unchanged += 1
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(path.name + ".tmp")
+        temporary.write_bytes(body)
+        os.replace(temporary, path)
+        self.written += 1
+
+    def emit(self, namespace, name, body, suffix=".json", hashed=True):
+        """Write ``body`` under a logical name and record it in the manifest"""
+        relative = f"{name}.{content_hash(body)}{suffix}" if hashed else f"{name}{suffix}"
+        if hashed and (self.out / relative).exists():
+            # Same name means same content
+            self.unchanged += 1
+        else:
+            self._write_file(relative, body)
+        self.files.setdefault(namespace, {})[name] = relative
+
+    def _unchanged(self, namespace):
+        revision = revisions.current(namespace)
+        return (
+            revision is not None
+            and self.previous.get("html") == self.html_pages
+            and self.previous.get("revisions", {}).get(namespace) == revision[0]
+            and namespace in self.previous.get("files", {})
+            and all((self.out / relative).exists() for relative in self.previous["files"][namespace].values())
+        )
+
+    async def export_portfolio(self, lang):
+        self.emit("portfolio", f"{lang}/portfolio", (await load_portfolio(lang)).body)
+
+    async def export_timeline(self, lang):
+        self.emit("timeline", f"{lang}/timeline", (await load_timeline(lang)).body)
+
+    async def export_projects(self, lang):
+        self.emit("projects", f"{lang}/projects", (await load_projects(lang, False)).body)
+        self.emit("projects", f"{lang}/projects-featured", (await load_projects(lang, True)).body)
+
+    async def export_blog(self, lang):
+        """Write every listing page and every published post of one language"""
+        page = 1
+        position = None
+        while True:
+            listing = await load_blog_posts(lang, STATIC_BLOG_PAGE_SIZE, position=position)
+            self.emit("blog", f"{lang}/blog/page-{page}", listing.body)
+
+            for post in listing.data:
+                if not SAFE_SLUG.match(post["slug"]):
+                    print(f"⚠️  Skipped blog post with unsafe slug {post['slug']!r}")
+                    continue
+                detail = await load_blog_post(lang, post["slug"])
+                self.emit("blog", f"{lang}/blog/posts/{post['slug']}", detail.body)
+                if self.html_pages:
+                    self.emit(
+                        "blog",
+                        f"{lang}/blog/{post['slug']}/index",
+                        render_html(lang, detail.data),
+                        suffix=".html",
+                        hashed=False
+                    )
+
+            cursor = listing.headers.get(NEXT_CURSOR_HEADER)
+            if not cursor:
+                break
+            position = decode_cursor(cursor)
+            page += 1
+        self.pages[lang] = page
+
+    async def run(self):
+        exporters = {
+            "portfolio": self.export_portfolio,
+            "timeline": self.export_timeline,
+            "projects": self.export_projects,
+            "blog": self.export_blog,
+        }
+        for namespace, exporter in exporters.items():
+            if self._unchanged(namespace):
+                self.files[namespace] = self.previous["files"][namespace]
+                if namespace == "blog":
+                    self.pages = self.previous.get("blog_pages", {})
+                continue
+            for lang in LANGUAGES:
+                try:
+                    await exporter(lang)
+                except HTTPException as e:
+                    # e.g. no portfolio document yet
+                    print(f"⚠️  Skipped {namespace} ({lang}): {e.detail}")
+
+        manifest = {
+            "generated_at": datetime.utcnow().isoformat(),
+            "revisions": {
+                namespace: revisions.current(namespace)[0]
+                for namespace in exporters if revisions.current(namespace)
+            },
+            "html": self.html_pages,
+            "blog_pages": self.pages,
+            "files": self.files,
+        }
+        self._write_file(MANIFEST, orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
+        return self.prune()
+
+    def prune(self):
+        """Delete export files the new manifest no longer references"""
+        referenced = {MANIFEST} | {
+            relative for files in self.files.values() for relative in files.values()
+        }
+        removed = 0
+        for path in self.out.rglob("*"):
+            if path.is_file() and path.relative_to(self.out).as_posix() not in referenced:
+                path.unlink()
+                removed += 1
+        for path in sorted(self.out.rglob("*"), reverse=True):
+            if path.is_dir() and not any(path.iterdir()):
+                path.rmdir()
+        return removed
+
+async def export(out=STATIC_EXPORT_DIR, html_pages=False, full=False):
+    """Export all content to ``out`` and return (written, unchanged, removed) counts"""
+    await revisions.load()
+    run = StaticExport(out, html_pages, full)
+    removed = await run.run()
+    return run.written, run.unchanged, removed
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", type=Path, default=STATIC_EXPORT_DIR, help="Output directory")
+    parser.add_argument("--html", action="store_true", help="Also write an HTML page per blog post")
+    parser.add_argument("--full", action="store_true", help="Ignore the previous manifest")
+    return parser.parse_args(argv)
+
+async def main(argv=None):
+    args = parse_args(argv)
+    written, unchanged, removed = await export(args.out, args.html, args.full)
+    print(f"🎉 Static export to {args.out}: {written} written, {unchanged} unchanged, {removed} removed")
+
+if __name__ == "__main__":
+    asyncio.run(main())
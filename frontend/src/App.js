@@ -9,6 +9,7 @@ import Projects from './pages/Projects';
 import Blog from './pages/Blog';
 import Contact from './pages/Contact';
 import { Toaster } from './components/ui/toaster';
+import { BootstrapProvider } from './hooks/usePortfolio';
 import './App.css';
 
 function App() {
@@ -35,18 +36,21 @@ function App() {
   return (
     <div className="App min-h-screen bg-gray-50">
       <BrowserRouter>
-        <Header language={language} onLanguageChange={handleLanguageChange} />
-        <main className="flex-1">
-          <Routes>
-            <Route path="/" element={<Home language={language} />} />
-            <Route path="/about" element={<About language={language} />} />
-            <Route path="/resume" element={<Resume language={language} />} />
-            <Route path="/projects" element={<Projects language={language} />} />
-            <Route path="/blog" element={<Blog language={language} />} />
-            <Route path="/contact" element={<Contact language={language} />} />
-          </Routes>
-        </main>
-        <Footer language={language} />
+        {/* One /api/bootstrap request supplies every page's initial content */}
+        <BootstrapProvider language={language}>
+          <Header language={language} onLanguageChange={handleLanguageChange} />
+          <main className="flex-1">
+            <Routes>
+              <Route path="/" element={<Home language={language} />} />
+              <Route path="/about" element={<About language={language} />} />
+              <Route path="/resume" element={<Resume language={language} />} />
+              <Route path="/projects" element={<Projects language={language} />} />
+              <Route path="/blog" element={<Blog language={language} />} />
+              <Route path="/contact" element={<Contact language={language} />} />
+            </Routes>
+          </main>
+          <Footer language={language} />
+        </BootstrapProvider>
         <Toaster />
       </BrowserRouter>
     </div>
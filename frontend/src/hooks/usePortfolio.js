@@ -1,108 +1,144 @@
-import { useState, useEffect } from 'react';
+import { createContext, createElement, useContext, useEffect, useMemo, useState } from 'react';
 import { portfolioAPI } from '../services/api';
 
-export const usePortfolio = (language = 'en') => {
-  const [portfolioData, setPortfolioData] = useState(null);
-  const [loading, setLoading] = useState(true);
-  const [error, setError] = useState(null);
+// Blog posts included in /api/bootstrap (BOOTSTRAP_BLOG_LIMIT in the backend)
+const BOOTSTRAP_BLOG_LIMIT = 10;
 
-  useEffect(() => {
-    const fetchPortfolio = async () => {
-      try {
-        setLoading(true);
-        setError(null);
-        const data = await portfolioAPI.getPortfolio(language);
-        setPortfolioData(data);
-      } catch (err) {
-        setError(err.message);
-        console.error('Error fetching portfolio:', err);
-      } finally {
-        setLoading(false);
-      }
-    };
+const BootstrapContext = createContext(null);
 
-    fetchPortfolio();
-  }, [language]);
-
-  return { portfolioData, loading, error };
-};
-
-export const useTimeline = (language = 'en') => {
-  const [timelineData, setTimelineData] = useState([]);
-  const [loading, setLoading] = useState(true);
-  const [error, setError] = useState(null);
+export const useBootstrap = (language = 'en') => {
+  const [bootstrap, setBootstrap] = useState({ language: null, data: null, error: null });
 
   useEffect(() => {
-    const fetchTimeline = async () => {
+    let cancelled = false;
+
+    const fetchBootstrap = async () => {
       try {
-        setLoading(true);
-        setError(null);
-        const data = await portfolioAPI.getTimeline(language);
-        setTimelineData(data);
+        const data = await portfolioAPI.getBootstrap(language);
+        if (!cancelled) setBootstrap({ language, data, error: null });
       } catch (err) {
-        setError(err.message);
-        console.error('Error fetching timeline:', err);
-      } finally {
-        setLoading(false);
+        console.error('Error fetching site content:', err);
+        if (!cancelled) setBootstrap({ language, data: null, error: err.message });
       }
     };
 
-    fetchTimeline();
+    fetchBootstrap();
+    return () => {
+      cancelled = true;
+    };
   }, [language]);
 
-  return { timelineData, loading, error };
+  // Until the new language arrives, the previous one must not be shown
+  const loading = bootstrap.language !== language;
+  return {
+    bootstrapData: loading ? null : bootstrap.data,
+    loading,
+    error: loading ? null : bootstrap.error,
+  };
 };
 
-export const useProjects = (language = 'en', featuredOnly = false) => {
-  const [projectsData, setProjectsData] = useState([]);
-  const [loading, setLoading] = useState(true);
+// Loads all initial page content in one request; the content hooks below
+// read from it instead of fetching their endpoints separately
+export const BootstrapProvider = ({ language, children }) => {
+  const { bootstrapData, loading, error } = useBootstrap(language);
+  const value = useMemo(
+    () => ({ language, bootstrapData, loading, error }),
+    [language, bootstrapData, loading, error]
+  );
+  return createElement(BootstrapContext.Provider, { value }, children);
+};
+
+// Serve `section` of the bootstrap payload when it covers the request,
+// otherwise (no provider, other parameters, bootstrap failed) fetch it
+const useContent = (section, language, initial, fetchData, description, deps) => {
+  const bootstrap = useContext(BootstrapContext);
+  const shared = section && bootstrap && bootstrap.language === language && !bootstrap.error;
+
+  const [data, setData] = useState(initial);
+  const [loading, setLoading] = useState(!shared);
   const [error, setError] = useState(null);
 
   useEffect(() => {
-    const fetchProjects = async () => {
+    if (shared) return undefined;
+    let cancelled = false;
+
+    const fetchContent = async () => {
       try {
         setLoading(true);
         setError(null);
-        const data = await portfolioAPI.getProjects(language, featuredOnly);
-        setProjectsData(data);
+        const result = await fetchData();
+        if (!cancelled) setData(result);
       } catch (err) {
-        setError(err.message);
-        console.error('Error fetching projects:', err);
+        if (!cancelled) setError(err.message);
+        console.error(`Error fetching ${description}:`, err);
       } finally {
-        setLoading(false);
+        if (!cancelled) setLoading(false);
       }
     };
 
-    fetchProjects();
-  }, [language, featuredOnly]);
-
-  return { projectsData, loading, error };
+    fetchContent();
+    return () => {
+      cancelled = true;
+    };
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [shared, ...deps]);
+
+  if (shared) {
+    return {
+      data: bootstrap.bootstrapData ? bootstrap.bootstrapData[section] : initial,
+      loading: bootstrap.loading,
+      error: null,
+    };
+  }
+  return { data, loading, error };
 };
 
-export const useBlog = (language = 'en', limit = 10) => {
-  const [blogData, setBlogData] = useState([]);
-  const [loading, setLoading] = useState(true);
-  const [error, setError] = useState(null);
+export const usePortfolio = (language = 'en') => {
+  const { data, loading, error } = useContent(
+    'portfolio',
+    language,
+    null,
+    () => portfolioAPI.getPortfolio(language),
+    'portfolio',
+    [language]
+  );
+  return { portfolioData: data, loading, error };
+};
 
-  useEffect(() => {
-    const fetchBlog = async () => {
-      try {
-        setLoading(true);
-        setError(null);
-        const data = await portfolioAPI.getBlogPosts(language, limit);
-        setBlogData(data);
-      } catch (err) {
-        setError(err.message);
-        console.error('Error fetching blog posts:', err);
-      } finally {
-        setLoading(false);
-      }
-    };
+export const useTimeline = (language = 'en') => {
+  const { data, loading, error } = useContent(
+    'timeline',
+    language,
+    [],
+    () => portfolioAPI.getTimeline(language),
+    'timeline',
+    [language]
+  );
+  return { timelineData: data, loading, error };
+};
 
-    fetchBlog();
-  }, [language, limit]);
+export const useProjects = (language = 'en', featuredOnly = false) => {
+  const { data, loading, error } = useContent(
+    featuredOnly ? null : 'projects',
+    language,
+    [],
+    () => portfolioAPI.getProjects(language, featuredOnly),
+    'projects',
+    [language, featuredOnly]
+  );
+  return { projectsData: data, loading, error };
+};
 
-  return { blogData, loading, error };
+export const useBlog = (language = 'en', limit = 10) => {
+  const { data, loading, error } = useContent(
+    limit === BOOTSTRAP_BLOG_LIMIT ? 'blog' : null,
+    language,
+    [],
+    () => portfolioAPI.getBlogPosts(language, limit),
+    'blog posts',
+    [language, limit]
+  );
+  return { blogData: data, loading, error };
 };
 
-export default usePortfolio;
\ No newline at end of file
+export default usePortfolio;
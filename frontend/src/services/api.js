@@ -23,6 +23,16 @@ apiClient.interceptors.response.use(
 
 // API service functions
 export const portfolioAPI = {
+  // Get all content for the initial page load in a single request
+  getBootstrap: async (language = 'en') => {
+    try {
+      const response = await apiClient.get(`/bootstrap?lang=${language}`);
+      return response.data;
+    } catch (error) {
+      throw new Error('Failed to fetch site content');
+    }
+  },
+
   // Get portfolio content (personal info, home, about)
   getPortfolio: async (language = 'en') => {
     try {
@@ -73,6 +83,18 @@ export const portfolioAPI = {
     }
   },
 
+  // Search blog posts and projects
+  search: async (query, language = 'en', limit = 10) => {
+    try {
+      const response = await apiClient.get('/search', {
+        params: { q: query, lang: language, limit },
+      });
+      return response.data;
+    } catch (error) {
+      throw new Error('Failed to search content');
+    }
+  },
+
   // Submit contact form
   submitContact: async (contactData) => {
     try {
@@ -0,0 +1,167 @@
+"""Per-item status bookkeeping of bulk upserts (backend/bulk.py)"""
+from pathlib import Path
+import asyncio
+import sys
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import bulk
+from bulk import bulk_upsert
+
+
+class Cursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def to_list(self, length):
+        return self.documents
+
+
+class FakeCollection:
+    """Collection whose ``bulk_write`` reports scripted upserts and write errors
+
+    ``upserted`` and ``write_errors`` hold positions in the operations list,
+    as MongoDB reports them.
+    """
+
+    def __init__(self, upserted=(), write_errors=None):
+        self.upserted = list(upserted)
+        self.write_errors = write_errors or {}
+        self.writes = []
+        self.reads = []
+
+    async def bulk_write(self, operations, ordered=True):
+        self.writes.append((len(operations), ordered))
+        if self.write_errors:
+            errors = [
+                {"index": index, "code": code, "errmsg": errmsg}
+                for index, (code, errmsg) in sorted(self.write_errors.items())
+            ]
+            upserted = [{"index": index, "_id": f"oid-{index}"} for index in self.upserted]
+            raise BulkWriteError({"writeErrors": errors, "upserted": upserted})
+        return type("Result", (), {"upserted_ids": {index: f"oid-{index}" for index in self.upserted}})()
+
+    def find(self, query):
+        keys = query["id"]["$in"]
+        self.reads.append(keys)
+        return Cursor([{"id": key} for key in keys])
+
+
+class FakeDatabase:
+    def __init__(self, collection):
+        self.collection = collection
+
+    def __getitem__(self, name):
+        return self.collection
+
+
+class Recorder:
+    def __init__(self):
+        self.materialized = []
+        self.bumped = []
+
+    async def materialize_many(self, collection, documents):
+        self.materialized.extend(document["id"] for document in documents)
+
+    async def bump(self, namespace):
+        self.bumped.append(namespace)
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    recorder = Recorder()
+    monkeypatch.setattr(bulk, "materialize_many", recorder.materialize_many)
+    monkeypatch.setattr(bulk.revisions, "bump", recorder.bump)
+    return recorder
+
+
+def use_collection(monkeypatch, collection):
+    monkeypatch.setattr(bulk, "db", FakeDatabase(collection))
+    return collection
+
+
+def timeline_item(id, **overrides):
+    item = {
+        "id": id,
+        "year": "2024",
+        "title": {"en": "Engineer", "no": "Utvikler"},
+        "company": {"en": "Company", "no": "Selskap"},
+        "description": {"en": "Work", "no": "Arbeid"},
+        "order": 1,
+        "created_at": "2024-05-01T12:00:00",
+    }
+    return {**item, **overrides}
+
+
+def statuses(results):
+    return [item["status"] for item in results]
+
+
+def test_ordered_batch_stops_at_a_render_failure(monkeypatch, recorder):
+    collection = use_collection(monkeypatch, FakeCollection(upserted=[0]))
+    documents = [
+        timeline_item("a"),
+        timeline_item("b", company=None),
+        timeline_item("c"),
+        timeline_item("d"),
+    ]
+
+    results, counts = asyncio.run(bulk_upsert("timeline", "timeline", documents, "id", ordered=True))
+
+    assert statuses(results) == ["created", "failed", "skipped", "skipped"]
+    assert "Cannot render timeline document" in results[1]["error"]
+    assert counts == {"created": 1, "updated": 0, "failed": 1, "skipped": 2}
+    # Only the items before the failure are sent
+    assert collection.writes == [(1, True)]
+    assert recorder.materialized == ["a"]
+    assert recorder.bumped == ["timeline"]
+
+
+def test_unordered_write_error_is_mapped_to_its_document(monkeypatch, recorder):
+    # Document 1 is not sent, so operation 2 is document 3
+    collection = use_collection(monkeypatch, FakeCollection(
+        upserted=[0],
+        write_errors={2: (11000, "E11000 duplicate key error")},
+    ))
+    documents = [
+        timeline_item("a"),
+        timeline_item("b", title={"en": "English only"}),
+        timeline_item("c"),
+        timeline_item("d"),
+    ]
+
+    results, counts = asyncio.run(bulk_upsert("timeline", "timeline", documents, "id"))
+
+    assert statuses(results) == ["created", "failed", "updated", "failed"]
+    assert results[3]["error"] == "E11000 duplicate key error"
+    assert counts == {"created": 1, "updated": 1, "failed": 2, "skipped": 0}
+    assert collection.writes == [(3, False)]
+    assert recorder.materialized == ["a", "c"]
+
+
+def test_upserted_items_are_created_and_the_rest_updated(monkeypatch, recorder):
+    collection = use_collection(monkeypatch, FakeCollection(upserted=[1, 2]))
+    documents = [timeline_item("a"), timeline_item("b"), timeline_item("c")]
+
+    results, counts = asyncio.run(bulk_upsert("timeline", "timeline", documents, "id"))
+
+    assert statuses(results) == ["updated", "created", "created"]
+    assert [item["key"] for item in results] == ["a", "b", "c"]
+    assert counts == {"created": 2, "updated": 1, "failed": 0, "skipped": 0}
+    assert collection.reads == [["a", "b", "c"]]
+    assert recorder.bumped == ["timeline"]
+
+
+def test_nothing_written_leaves_views_and_revision_alone(monkeypatch, recorder):
+    collection = use_collection(monkeypatch, FakeCollection())
+    documents = [timeline_item("a", company=None)]
+
+    results, counts = asyncio.run(bulk_upsert("timeline", "timeline", documents, "id", ordered=True))
+
+    assert statuses(results) == ["failed"]
+    assert collection.writes == []
+    assert recorder.materialized == []
+    assert recorder.bumped == []
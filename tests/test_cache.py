@@ -0,0 +1,233 @@
+"""Concurrency behaviour of the content cache (backend/cache.py)"""
+from pathlib import Path
+import asyncio
+import contextvars
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import cache
+from cache import HIT, MISS, STALE, ContentCache
+from starlette.exceptions import HTTPException
+
+
+class Clock:
+    """Stand-in for the ``time`` module with a manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache, "time", clock)
+    return clock
+
+
+def make_cache(**options):
+    options = {"max_entries": 16, "ttl": 60, "refresh_ahead": 0, "stale_if_error": 300, **options}
+    return ContentCache(**options)
+
+
+class Loader:
+    """Counting loader whose calls block until ``release`` (when gated)"""
+
+    def __init__(self, *values, gated=False):
+        self.values = list(values)
+        self.calls = 0
+        self.gate = asyncio.Event()
+        if not gated:
+            self.gate.set()
+
+    def release(self):
+        self.gate.set()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.gate.wait()
+        value = self.values.pop(0) if len(self.values) > 1 else self.values[0]
+        if isinstance(value, BaseException):
+            raise value
+        return value
+
+
+async def settle():
+    """Let scheduled tasks and their done callbacks run"""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_concurrent_misses_share_one_load(clock):
+    async def scenario():
+        content = make_cache()
+        loader = Loader(["post"], gated=True)
+        lookups = [asyncio.ensure_future(content.lookup("blog", ("en",), loader)) for _ in range(10)]
+        await settle()
+        loader.release()
+        results = await asyncio.gather(*lookups)
+
+        assert loader.calls == 1
+        assert all(value == ["post"] and outcome == MISS for value, outcome in results)
+        assert content.misses == 10
+        assert content.coalesced == 9
+        assert await content.lookup("blog", ("en",), loader) == (["post"], HIT)
+        assert not content._inflight
+
+    asyncio.run(scenario())
+
+
+def test_load_started_before_invalidation_is_not_cached_or_joined(clock):
+    async def scenario():
+        content = make_cache()
+        old = Loader("old", gated=True)
+        first = asyncio.ensure_future(content.lookup("blog", ("en",), old))
+        await settle()
+
+        content.invalidate("blog")
+        new = Loader("new")
+        assert await content.lookup("blog", ("en",), new) == ("new", MISS)
+        assert new.calls == 1
+
+        old.release()
+        assert await first == ("old", MISS)
+        assert content.get("blog", ("en",)) == "new"
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_leader_does_not_cancel_the_shared_load(clock):
+    async def scenario():
+        content = make_cache()
+        loader = Loader("post", gated=True)
+        leader = asyncio.ensure_future(content.lookup("blog", ("en",), loader))
+        await settle()
+        follower = asyncio.ensure_future(content.lookup("blog", ("en",), loader))
+        await settle()
+
+        leader.cancel()
+        await settle()
+        loader.release()
+
+        assert await follower == ("post", MISS)
+        assert leader.cancelled()
+        assert loader.calls == 1
+        assert content.get("blog", ("en",)) == "post"
+
+    asyncio.run(scenario())
+
+
+def test_hit_near_expiry_is_served_and_refreshed_in_the_background(clock):
+    request_id = contextvars.ContextVar("request_id", default=None)
+    seen = []
+
+    async def scenario():
+        content = make_cache(ttl=60, refresh_ahead=10)
+        assert await content.lookup("blog", ("en",), Loader("v1")) == ("v1", MISS)
+
+        async def reload():
+            seen.append(request_id.get())
+            return "v2"
+
+        clock.now += 55
+        request_id.set("request-1")
+        assert await content.lookup("blog", ("en",), reload) == ("v1", HIT)
+        # A second hit while the refresh is running does not start another
+        assert await content.lookup("blog", ("en",), reload) == ("v1", HIT)
+        await settle()
+
+        assert content.refreshes == 1
+        assert seen == [None]
+        assert await content.lookup("blog", ("en",), reload) == ("v2", HIT)
+
+    asyncio.run(scenario())
+
+
+def test_failed_refresh_keeps_the_cached_value(clock):
+    async def scenario():
+        content = make_cache(ttl=60, refresh_ahead=10)
+        await content.lookup("blog", ("en",), Loader("v1"))
+
+        clock.now += 55
+        assert await content.lookup("blog", ("en",), Loader(ConnectionError("down"))) == ("v1", HIT)
+        await settle()
+
+        assert content.refresh_failures == 1
+        assert content.get("blog", ("en",)) == "v1"
+
+    asyncio.run(scenario())
+
+
+def test_expired_value_is_served_when_the_load_fails(clock):
+    async def scenario():
+        content = make_cache(ttl=60, stale_if_error=300)
+        await content.lookup("blog", ("en",), Loader("v1"))
+
+        clock.now += 120
+        assert await content.lookup("blog", ("en",), Loader(ConnectionError("down"))) == ("v1", STALE)
+        assert content.stale_served == 1
+        # Recovered loads replace the stale value
+        assert await content.lookup("blog", ("en",), Loader("v2")) == ("v2", MISS)
+
+    asyncio.run(scenario())
+
+
+def test_invalidated_value_is_served_when_the_load_fails(clock):
+    async def scenario():
+        content = make_cache()
+        await content.lookup("blog", ("en",), Loader("v1"))
+
+        content.invalidate("blog")
+        assert content.get("blog", ("en",)) is None
+        assert await content.lookup("blog", ("en",), Loader(ConnectionError("down"))) == ("v1", STALE)
+
+    asyncio.run(scenario())
+
+
+def test_load_failure_past_the_stale_window_is_raised(clock):
+    async def scenario():
+        content = make_cache(ttl=60, stale_if_error=300)
+        await content.lookup("blog", ("en",), Loader("v1"))
+
+        clock.now += 400
+        with pytest.raises(ConnectionError):
+            await content.lookup("blog", ("en",), Loader(ConnectionError("down")))
+        assert content.stale_served == 0
+
+    asyncio.run(scenario())
+
+
+def test_http_errors_propagate_instead_of_stale_values(clock):
+    async def scenario():
+        content = make_cache()
+        await content.lookup("blog", ("post", "en"), Loader("v1"))
+
+        content.invalidate("blog")
+        with pytest.raises(HTTPException) as raised:
+            await content.lookup("blog", ("post", "en"), Loader(HTTPException(status_code=404)))
+        assert raised.value.status_code == 404
+        assert content.stale_served == 0
+
+    asyncio.run(scenario())
+
+
+def test_equal_reload_keeps_the_cached_object(clock):
+    async def scenario():
+        content = make_cache(ttl=60)
+        original, _ = await content.lookup("blog", ("en",), Loader(["post"]))
+
+        clock.now += 120
+        reloaded, outcome = await content.lookup("blog", ("en",), Loader(["post"]))
+        assert outcome == MISS
+        assert reloaded is original
+
+        clock.now += 120
+        changed, _ = await content.lookup("blog", ("en",), Loader(["edited"]))
+        assert changed == ["edited"]
+
+    asyncio.run(scenario())
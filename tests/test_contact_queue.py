@@ -0,0 +1,217 @@
+"""Spooling, replay and dead-lettering of the contact queue (backend/contact_queue.py)"""
+from datetime import datetime
+from pathlib import Path
+import asyncio
+import sys
+import uuid
+
+import orjson
+import pytest
+from pymongo.errors import AutoReconnect, DocumentTooLarge
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import contact_queue
+from contact_queue import ContactQueue
+
+
+class FakeContacts:
+    """``db.contacts`` stand-in; ``failures`` maps a subject to the error raised for it"""
+
+    def __init__(self, failures=None, blocked=False):
+        self.stored = {}
+        self.failures = failures or {}
+        self.calls = 0
+        self.gate = asyncio.Event()
+        if not blocked:
+            self.gate.set()
+
+    async def insert_many(self, documents, ordered=False):
+        self.calls += 1
+        await self.gate.wait()
+        for document in documents:
+            error = self.failures.get(document["subject"])
+            if error is not None:
+                if isinstance(error, list):
+                    # Raised once, then the insert succeeds
+                    error = error.pop() if error else None
+                if error is not None:
+                    raise error
+        for document in documents:
+            self.stored[document["id"]] = document
+
+
+class FakeDatabase:
+    def __init__(self, contacts):
+        self.contacts = contacts
+
+
+@pytest.fixture
+def contacts(monkeypatch):
+    contacts = FakeContacts()
+    monkeypatch.setattr(contact_queue, "db", FakeDatabase(contacts))
+    monkeypatch.setattr(contact_queue, "CONTACT_BATCH_WAIT", 0.01)
+    return contacts
+
+
+def submission(subject="Hello"):
+    return {
+        "id": str(uuid.uuid4()),
+        "name": "Reader",
+        "email": "reader@example.com",
+        "subject": subject,
+        "message": "Hi",
+        "read": False,
+        "submitted_at": datetime(2024, 5, 1, 12, 0),
+    }
+
+
+def write_spool(path, *records):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"".join(orjson.dumps(record) + b"\n" for record in records))
+
+
+async def wait_for(condition, timeout=5):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def test_unflushed_submissions_are_replayed(tmp_path, contacts):
+    pending, flushed = submission("pending"), submission("flushed")
+    write_spool(
+        tmp_path / "spool-0.ndjson",
+        {"op": "add", "doc": pending},
+        {"op": "add", "doc": flushed},
+        {"op": "done", "ids": [flushed["id"]]},
+    )
+
+    async def scenario():
+        queue = ContactQueue(tmp_path, dead_letter_path=tmp_path / "dead.ndjson")
+        await queue.start()
+        await wait_for(lambda: pending["id"] in contacts.stored)
+        await queue.stop()
+        return queue
+
+    queue = asyncio.run(scenario())
+    assert list(contacts.stored) == [pending["id"]]
+    assert ContactQueue._read_spool(queue.spool_path) == []
+
+
+def test_each_process_spools_to_its_own_slot(tmp_path, contacts):
+    contacts.gate.clear()
+
+    async def scenario():
+        first = ContactQueue(tmp_path, dead_letter_path=tmp_path / "dead.ndjson")
+        second = ContactQueue(tmp_path, dead_letter_path=tmp_path / "dead.ndjson")
+        await first.start()
+        await second.start()
+        a, b = submission("a"), submission("b")
+        await first.submit(a)
+        await second.submit(b)
+
+        assert first.spool_path != second.spool_path
+        assert [d["id"] for d in ContactQueue._read_spool(first.spool_path)] == [a["id"]]
+        assert [d["id"] for d in ContactQueue._read_spool(second.spool_path)] == [b["id"]]
+
+        contacts.gate.set()
+        await first.stop()
+        await second.stop()
+
+    asyncio.run(scenario())
+    assert len(contacts.stored) == 2
+
+
+def test_spools_of_stopped_processes_are_adopted(tmp_path, contacts):
+    orphan = submission("orphan")
+    write_spool(tmp_path / "spool-3.ndjson", {"op": "add", "doc": orphan})
+
+    async def scenario():
+        queue = ContactQueue(tmp_path, dead_letter_path=tmp_path / "dead.ndjson")
+        await queue.start()
+        await wait_for(lambda: orphan["id"] in contacts.stored)
+        await queue.stop()
+        return queue
+
+    queue = asyncio.run(scenario())
+    assert queue.spool_path.name == "spool-0.ndjson"
+    assert not (tmp_path / "spool-3.ndjson").exists()
+
+
+def test_spools_of_running_processes_are_left_alone(tmp_path, contacts):
+    contacts.gate.clear()
+
+    async def scenario():
+        running = ContactQueue(tmp_path, dead_letter_path=tmp_path / "dead.ndjson")
+        await running.start()
+        await running.submit(submission("running"))
+
+        starting = ContactQueue(tmp_path, dead_letter_path=tmp_path / "dead.ndjson")
+        await starting.start()
+        assert starting._replay == []
+        assert len(ContactQueue._read_spool(running.spool_path)) == 1
+
+        contacts.gate.set()
+        await running.stop()
+        await starting.stop()
+
+    asyncio.run(scenario())
+    assert len(contacts.stored) == 1
+
+
+def test_spool_is_compacted_as_it_grows(tmp_path, contacts, monkeypatch):
+    monkeypatch.setattr(contact_queue, "CONTACT_SPOOL_COMPACT_BYTES", 2000)
+
+    async def scenario():
+        queue = ContactQueue(tmp_path, dead_letter_path=tmp_path / "dead.ndjson")
+        await queue.start()
+        for _ in range(50):
+            await queue.submit(submission())
+            await asyncio.sleep(0.001)
+        await wait_for(lambda: len(contacts.stored) == 50)
+        await queue.stop()
+        return queue
+
+    queue = asyncio.run(scenario())
+    # 50 submissions are ~12 KB of "add" records
+    assert queue.spool_path.stat().st_size < 4000
+    assert ContactQueue._read_spool(queue.spool_path) == []
+
+
+def test_unstorable_submissions_are_dead_lettered(tmp_path, contacts):
+    contacts.failures["poison"] = DocumentTooLarge("too large")
+    good, poison = submission("good"), submission("poison")
+
+    async def scenario():
+        queue = ContactQueue(tmp_path, dead_letter_path=tmp_path / "dead.ndjson")
+        await queue.start()
+        await queue.submit(good)
+        await queue.submit(poison)
+        await wait_for(lambda: (tmp_path / "dead.ndjson").exists())
+        await queue.stop()
+        return queue
+
+    queue = asyncio.run(scenario())
+    assert list(contacts.stored) == [good["id"]]
+    dead = [orjson.loads(line) for line in (tmp_path / "dead.ndjson").read_bytes().splitlines()]
+    assert [record["doc"]["id"] for record in dead] == [poison["id"]]
+    assert "too large" in dead[0]["error"]
+    # Marked done, so it is not replayed on the next start
+    assert ContactQueue._read_spool(queue.spool_path) == []
+
+
+def test_transient_failures_are_retried(tmp_path, contacts):
+    contacts.failures["flaky"] = [AutoReconnect("connection reset")]
+    flaky = submission("flaky")
+
+    async def scenario():
+        queue = ContactQueue(tmp_path, dead_letter_path=tmp_path / "dead.ndjson")
+        await queue.start()
+        await queue.submit(flaky)
+        await wait_for(lambda: flaky["id"] in contacts.stored)
+        await queue.stop()
+
+    asyncio.run(scenario())
+    assert contacts.calls == 2
+    assert not (tmp_path / "dead.ndjson").exists()